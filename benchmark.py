@@ -0,0 +1,140 @@
+import argparse
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 项目模块在导入时读取数据路径等环境变量，所以都在 main() 设置好临时目录后才导入
+_LOGGER = logging.getLogger(__name__)
+
+
+def _mock_stats(base_url):
+    from nikke_autosign.transport import get_session
+
+    return get_session().get(f"{base_url}/__stats", timeout=5).json()
+
+
+def _reset_mock(base_url):
+    from nikke_autosign.transport import get_session
+
+    get_session().post(f"{base_url}/__reset", timeout=5)
+
+
+# 用 accounts_num 个账号并发执行完整签到流程（与 /sign 后台任务相同的 run_sign），统计耗时、上游调用数和限速等待时间
+def bench_sign(base_url, accounts_num, workers, budget, run_id):
+    from nikke_autosign import blablalink_reader
+    from nikke_autosign.metrics import percentile
+    from nikke_autosign.sign_runner import run_sign
+
+    _reset_mock(base_url)
+    pacer = blablalink_reader.PACER
+    wait_before = pacer.stats()["total_wait"]
+
+    def sign_one(index):
+        start = time.perf_counter()
+        result = run_sign({"bench_account": f"{run_id}-{index}"}, account=f"{run_id}-{index}", budget=budget)
+        return time.perf_counter() - start, result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, accounts_num))) as executor:
+        outcomes = list(executor.map(sign_one, range(accounts_num)))
+    wall = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in outcomes]
+    stats = _mock_stats(base_url)
+    return {
+        "accounts": accounts_num,
+        "wall_seconds": round(wall, 3),
+        "latency_p50": percentile(latencies, 0.5),
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_max": round(max(latencies), 3),
+        "success": sum(1 for _, result in outcomes if result["success"]),
+        "upstream_calls": stats["total_calls"],
+        "upstream_errors": sum(stats["errors"].values()),
+        "calls_by_endpoint": stats["calls"],
+        "pacing_sleep_seconds": round(pacer.stats()["total_wait"] - wait_before, 3),
+        "throughput_accounts_per_sec": round(accounts_num / wall, 3) if wall else None,
+    }
+
+
+# 直接压测 reader：串行调用 read_post，统计单次请求延迟
+def bench_reader(base_url, requests_num):
+    from nikke_autosign.blablalink_reader import BlablaLinkReader
+    from nikke_autosign.metrics import percentile
+
+    _reset_mock(base_url)
+    reader = BlablaLinkReader(cookies={"bench_account": "reader"})
+    reader.init_session()
+    latencies = []
+    start = time.perf_counter()
+    for index in range(requests_num):
+        call_start = time.perf_counter()
+        reader.read_post(100000 + index)
+        latencies.append(time.perf_counter() - call_start)
+    wall = time.perf_counter() - start
+    return {
+        "requests": requests_num,
+        "wall_seconds": round(wall, 3),
+        "latency_mean": round(statistics.mean(latencies), 4),
+        "latency_p95": percentile(latencies, 0.95),
+        "requests_per_sec": round(requests_num / wall, 3) if wall else None,
+    }
+
+
+def run_benchmark(args):
+    from nikke_autosign import blablalink_reader
+    from mock_blablalink import start_mock_server
+    from nikke_autosign.pacing import Pacer
+
+    mock_server, mock_url = start_mock_server(latency=args.latency, error_rate=args.error_rate,
+                                              feed_size=args.feed_size)
+    blablalink_reader.API_HOST = mock_url
+    if args.rate is not None or args.burst is not None:
+        default_pacer = blablalink_reader.PACER
+        blablalink_reader.PACER = Pacer(rate=args.rate or default_pacer.rate, burst=args.burst or default_pacer.burst,
+                                        jitter=default_pacer.jitter)
+
+    report = {"sign": []}
+    try:
+        for run_index, accounts_num in enumerate(int(num) for num in args.accounts.split(",")):
+            report["sign"].append(bench_sign(mock_url, accounts_num, args.workers, args.budget, f"run{run_index}"))
+        if args.reader_requests:
+            report["reader"] = bench_reader(mock_url, args.reader_requests)
+    finally:
+        mock_server.shutdown()
+    return report
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler()])
+    parser = argparse.ArgumentParser(description="基于本地替身服务的离线签到压测")
+    parser.add_argument("--accounts", default="1,2,4,8", help="账号数量序列，逗号分隔")
+    parser.add_argument("--workers", type=int, default=8, help="并发签到的账号数")
+    parser.add_argument("--budget", type=float, default=120, help="每个账号的时间预算（秒）")
+    parser.add_argument("--latency", type=float, default=0.05, help="替身服务平均响应延迟（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="替身服务返回 503 的概率")
+    parser.add_argument("--feed-size", type=int, default=200, help="推荐列表帖子总数")
+    parser.add_argument("--rate", type=float, default=None, help="覆盖全局限速（每秒请求数）")
+    parser.add_argument("--burst", type=float, default=None, help="覆盖限速突发数")
+    parser.add_argument("--reader-requests", type=int, default=0, help="额外直接压测 reader 的请求数")
+    args = parser.parse_args()
+
+    # 压测使用临时的帖子索引、通知队列和运行历史，避免污染正式数据，结束后删除
+    with tempfile.TemporaryDirectory(prefix="nikke_bench_") as bench_dir:
+        os.environ.setdefault("FEED_INDEX_PATH", os.path.join(bench_dir, "feed_index.db"))
+        os.environ.setdefault("NOTIFY_QUEUE_DIR", os.path.join(bench_dir, "notify_queue"))
+        os.environ.setdefault("RUN_HISTORY_PATH", os.path.join(bench_dir, "run_history.db"))
+        report = run_benchmark(args)
+        # 运行历史由后台线程写入，删除临时目录前先写完并关闭
+        from nikke_autosign.run_history import get_run_history
+
+        get_run_history().close()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+import argparse
+import json
+import logging
+import random
+import secrets
+import threading
+import time
+from collections import Counter
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_LOGGER = logging.getLogger(__name__)
+
+# 本地替身服务，模拟 BlablaLinkReader 用到的接口，用于离线压测：
+# GetPostList（带游标分页）、GetPost、PostStar、DailyCheckIn、GetTaskListWithStatusV2、GetUserTotalPoints。
+# 账号以请求的 Cookie 头区分；GET /__stats 返回各接口调用次数，POST /__reset 清空状态。
+# 同时提供替身登录页（设置 BLABLALINK_WEB_URL 指向本服务），用于测试 auto_refresh_cookies 的登录流程：
+# GET /login 返回与真实页面相同 id 的登录表单，已登录时表单先渲染、稍后再跳转到首页；
+# POST /login 校验账号密码后下发会话 cookie 并跳转到首页
+
+CHECK_IN_POINTS = 10
+READ_TASK_NUM = 3
+LIKE_TASK_NUM = 5
+# 替身登录页的会话 cookie 名称和有效期（秒）
+SESSION_COOKIE = "mock_session"
+SESSION_MAX_AGE = 7 * 86400
+# 已登录时登录页延迟多久跳转，模拟真实页面先渲染表单再跳转
+LOGIN_REDIRECT_DELAY_MS = 500
+
+_LOGIN_PAGE = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>mock login</title></head><body>
+<form method="post" action="/login">
+<input id="loginPwdForm_account" name="account" type="text">
+<input id="loginPwdForm_password" name="password" type="password">
+<button name="confirm" type="submit">登入</button>
+</form>{script}
+</body></html>'''
+_REDIRECT_SCRIPT = '''
+<script>setTimeout(function () {{ window.location.replace("/"); }}, {delay});</script>'''
+_HOME_PAGE = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>mock home</title></head><body>{user}</body></html>'''
+
+
+class MockState:
+    def __init__(self, feed_size=200, page_size=10, latency=0.05, latency_jitter=0.02, error_rate=0.0,
+                 web_users=None):
+        self.feed_size = feed_size
+        self.page_size = page_size
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        # 替身登录页接受的账号 {email: password}，为 None 时接受任意非空账号密码
+        self.web_users = web_users
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.calls = Counter()
+            self.errors = Counter()
+            self.checked_in = set()
+            self.read = {}
+            self.liked = {}
+            # 会话 token -> 登录的账号
+            self.sessions = {}
+
+    def account_state(self, account):
+        return self.read.setdefault(account, set()), self.liked.setdefault(account, set())
+
+    def stats(self):
+        with self.lock:
+            return {"calls": dict(self.calls), "errors": dict(self.errors), "total_calls": sum(self.calls.values())}
+
+
+def _ok(data):
+    return {"code": 0, "msg": "ok", "data": data}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: MockState = None
+
+    def log_message(self, format, *args):
+        _LOGGER.debug(format, *args)
+
+    def _reply(self, status, payload=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reply_html(self, status, html, headers=None):
+        body = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or []):
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _redirect(self, location, headers=None):
+        self._reply_html(302, "", headers=[("Location", location)] + (headers or []))
+
+    def _session_user(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = cookie.get(SESSION_COOKIE)
+        if morsel is None:
+            return None
+        with self.state.lock:
+            return self.state.sessions.get(morsel.value)
+
+    def _web(self, method, path):
+        state = self.state
+        user = self._session_user()
+        if path == "/":
+            return self._reply_html(200, _HOME_PAGE.format(user=user or ""))
+        if method == "GET":
+            script = _REDIRECT_SCRIPT.format(delay=LOGIN_REDIRECT_DELAY_MS) if user else ""
+            return self._reply_html(200, _LOGIN_PAGE.format(script=script))
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8")) if length else {}
+        account = form.get("account", [""])[0]
+        password = form.get("password", [""])[0]
+        with state.lock:
+            state.calls["login"] += 1
+            valid = account and password and (state.web_users is None or state.web_users.get(account) == password)
+            if valid:
+                token = secrets.token_hex(16)
+                state.sessions[token] = account
+        if not valid:
+            return self._reply_html(401, _LOGIN_PAGE.format(script=""))
+        return self._redirect("/", headers=[
+            ("Set-Cookie", f"{SESSION_COOKIE}={token}; Path=/; Max-Age={SESSION_MAX_AGE}; HttpOnly")])
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        path = urlsplit(self.path).path
+        if path in ("/", "/login"):
+            return self._web(method, path)
+        body = self._read_json() if method == "POST" else {}
+        state = self.state
+        if path == "/__stats":
+            return self._reply(200, state.stats())
+        if path == "/__reset":
+            state.reset()
+            return self._reply(200, {"ok": True})
+
+        endpoint = path.rstrip("/").rsplit("/", 1)[-1]
+        handler = getattr(self, f"_api_{endpoint}", None)
+        if handler is None:
+            return self._reply(404, {"code": 404, "msg": "not found"})
+        with state.lock:
+            state.calls[endpoint] += 1
+        delay = state.latency + random.uniform(-state.latency_jitter, state.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if state.error_rate and random.random() < state.error_rate:
+            with state.lock:
+                state.errors[endpoint] += 1
+            return self._reply(503, {"code": 503, "msg": "mock error"})
+        account = self.headers.get("Cookie", "")
+        with state.lock:
+            payload = handler(state, account, body)
+        return self._reply(200, payload)
+
+    @staticmethod
+    def _api_GetPostList(state, account, body):
+        offset = int(body.get("nextPageCursor") or 0)
+        limit = int(body.get("limit") or state.page_size)
+        read, liked = state.account_state(account)
+        posts = []
+        for index in range(offset, min(offset + limit, state.feed_size)):
+            uuid = str(100000 + index)
+            posts.append({"post_uuid": uuid, "title": f"mock post {index}",
+                          "my_upvote": {"is_star": uuid in liked}})
+        next_offset = offset + limit
+        next_cursor = str(next_offset) if next_offset < state.feed_size else ""
+        return _ok({"list": posts, "page_info": {"next_page_cursor": next_cursor}})
+
+    @staticmethod
+    def _api_GetPost(state, account, body):
+        read, liked = state.account_state(account)
+        read.add(str(body["post_uuid"]))
+        return _ok({"post": {"post_uuid": body["post_uuid"], "content": "x" * 2000}})
+
+    @staticmethod
+    def _api_PostStar(state, account, body):
+        read, liked = state.account_state(account)
+        uuid = str(body["post_uuid"])
+        # 与真实接口一致：重复提交会取消点赞
+        if uuid in liked:
+            liked.remove(uuid)
+        else:
+            liked.add(uuid)
+        return _ok({})
+
+    @staticmethod
+    def _api_DailyCheckIn(state, account, body):
+        if account in state.checked_in:
+            return {"code": 1001, "msg": "already checked in", "data": {}}
+        state.checked_in.add(account)
+        return _ok({})
+
+    @staticmethod
+    def _api_GetTaskListWithStatusV2(state, account, body):
+        read, liked = state.account_state(account)
+        tasks = [
+            ("15", "每日簽到", account in state.checked_in),
+            ("16", f"瀏覽{READ_TASK_NUM}篇貼文", len(read) >= READ_TASK_NUM),
+            ("17", f"點讚{LIKE_TASK_NUM}篇貼文", len(liked) >= LIKE_TASK_NUM),
+        ]
+        return _ok({"tasks": [{"task_id": task_id, "task_name": name, "reward_infos": [{"is_completed": done}]}
+                              for task_id, name, done in tasks]})
+
+    @staticmethod
+    def _api_GetUserTotalPoints(state, account, body):
+        read, liked = state.account_state(account)
+        points = CHECK_IN_POINTS * (account in state.checked_in) + len(read) + len(liked)
+        return _ok({"total_points": points})
+
+
+# 在后台线程启动替身服务，返回 (server, base_url)
+def start_mock_server(host="127.0.0.1", port=0, **state_kwargs):
+    handler = type("BoundMockHandler", (MockHandler,), {"state": MockState(**state_kwargs)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-blablalink", daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler()])
+    parser = argparse.ArgumentParser(description="api.blablalink.com 本地替身服务")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.05, help="平均响应延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.02, help="延迟抖动（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 503 的概率")
+    parser.add_argument("--feed-size", type=int, default=200, help="推荐列表帖子总数")
+    args = parser.parse_args()
+
+    mock_server, base_url = start_mock_server(port=args.port, latency=args.latency, latency_jitter=args.jitter,
+                                              error_rate=args.error_rate, feed_size=args.feed_size)
+    _LOGGER.info(f"替身服务已启动: {base_url}，设置 BLABLALINK_API_URL={base_url} 即可让 reader 使用，"
+                 f"设置 BLABLALINK_WEB_URL={base_url} 即可让刷新脚本使用替身登录页")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock_server.shutdown()
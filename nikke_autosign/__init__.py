@@ -0,0 +1 @@
+# Nikke 自动签到。命令行入口见 cli.py（安装后为 nikke 命令），各模块也可通过 python -m nikke_autosign.<模块> 运行
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+
+from .blablalink_reader import BlablaLinkReader
+from .deadline import DeadlineExceeded
+from .tracing import span
+
+_LOGGER = logging.getLogger(__name__)
+
+# 阅读/点赞阶段同时进行的帖子数
+READ_LIKE_CONCURRENCY = int(os.getenv("READ_LIKE_CONCURRENCY", "4"))
+
+
+# BlablaLinkReader 的 asyncio 版本，接口与同步版保持一致。
+# 底层仍复用同步 reader 的 requests session，阻塞调用放到线程中执行，
+# 从而可以在事件循环里并发多个帖子的 阅读→点赞 链路。
+class AsyncBlablaLinkReader:
+    def __init__(self, cookies=None, reader: BlablaLinkReader | None = None, concurrency=READ_LIKE_CONCURRENCY):
+        self.reader = reader or BlablaLinkReader(cookies=cookies)
+        self.concurrency = max(1, concurrency)
+
+    def init_session(self):
+        if self.reader.session is None:
+            self.reader.init_session()
+
+    async def _call(self, func, *args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def check_in(self):
+        return await self._call(self.reader.check_in)
+
+    async def list_post(self, want=20, filter_is_liked=None, start_cursor=None, max_page=10):
+        return await self._call(self.reader.list_post, want=want, filter_is_liked=filter_is_liked,
+                                start_cursor=start_cursor, max_page=max_page)
+
+    async def read_post(self, uuid):
+        return await self._call(self.reader.read_post, uuid)
+
+    async def like_post(self, uuid):
+        return await self._call(self.reader.like_post, uuid)
+
+    async def check_task_finished(self, is_required=None):
+        return await self._call(self.reader.check_task_finished, is_required)
+
+    async def get_total_reward(self):
+        return await self._call(self.reader.get_total_reward)
+
+    async def read_and_like_post(self, uuid):
+        read_ret = await self.read_post(uuid)
+        like_ret = await self.like_post(uuid)
+        return read_ret, like_ret
+
+    async def _read_and_like_outcome(self, post):
+        uuid, title, is_liked = post
+        try:
+            with span("read_like", "post", post_uuid=uuid):
+                await self.read_and_like_post(uuid)
+            _LOGGER.info(f"阅读并点赞帖子成功, title={title}")
+            return post, None
+        except Exception as e:
+            return post, e
+
+    # 并发执行多个帖子的 阅读→点赞，同时进行的帖子数不超过 concurrency。
+    # 返回与 posts 顺序一致的 (post, error) 列表，error 为 None 表示成功
+    async def read_and_like_posts(self, posts, concurrency=None):
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.concurrency))
+
+        async def worker(post):
+            async with semaphore:
+                return await self._read_and_like_outcome(post)
+
+        return await asyncio.gather(*(worker(post) for post in posts))
+
+    # 边翻页边处理：从 post_iter（如 reader.iter_posts()）逐个取帖子并立即开始 阅读→点赞，
+    # 成功数（含进行中）达到 want 后不再取新帖子，失败的帖子会由后续帖子补上。
+    # 返回 (outcomes, list_error)，outcomes 为 (post, error) 列表，list_error 为翻页时的异常
+    async def read_and_like_stream(self, post_iter, want, concurrency=None):
+        concurrency = max(1, concurrency or self.concurrency)
+        post_iter = iter(post_iter)
+        outcomes = []
+        pending = set()
+        success_num = 0
+        list_error = None
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < concurrency and success_num + len(pending) < want:
+                # 时间预算用完后不再开始新的帖子
+                if self.reader.deadline.expired():
+                    list_error = DeadlineExceeded("阅读/点赞超时，时间预算已用完")
+                    exhausted = True
+                    break
+                try:
+                    post = await asyncio.to_thread(next, post_iter, None)
+                except Exception as e:
+                    list_error = e
+                    post = None
+                if post is None:
+                    exhausted = True
+                    break
+                pending.add(asyncio.create_task(self._read_and_like_outcome(post)))
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                post, error = task.result()
+                outcomes.append((post, error))
+                if error is None:
+                    success_num += 1
+                elif isinstance(error, DeadlineExceeded):
+                    list_error = error
+                    exhausted = True
+        close = getattr(post_iter, "close", None)
+        if close is not None:
+            close()
+        return outcomes, list_error
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler()])
+
+
+    async def main():
+        reader = AsyncBlablaLinkReader()
+        reader.init_session()
+        await reader.check_task_finished()
+        await reader.get_total_reward()
+
+
+    asyncio.run(main())
@@ -0,0 +1,302 @@
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+from .common import COOKIES_FILE_PATH, ACCOUNT_FILE_PATH, COOKIES_META_FILE_PATH, DEFAULT_ACCOUNT
+from .cookie_store import COOKIE_STORE, atomic_write_json
+from .ssh_tunnel import get_tunnel
+from .transport import get_session
+
+_LOGGER = logging.getLogger(__name__)
+
+# 要访问的网站，可通过环境变量指向本地的替身登录页用于测试
+WEB_URL = os.getenv("BLABLALINK_WEB_URL", "https://www.blablalink.com").rstrip("/")
+LOGIN_URL = f"{WEB_URL}/login"
+
+# 浏览器配置：BROWSER 可选 edge / chrome（Linux 上 chrome 也适用于 chromium），
+# WEBDRIVER_PATH 为空时由 selenium 自动查找驱动
+BROWSER = os.getenv("BROWSER", "edge").lower()
+WEBDRIVER_PATH = os.getenv("WEBDRIVER_PATH") or (
+    "./edgedriver_win64/msedgedriver.exe" if os.name == "nt" and BROWSER == "edge" else None)
+BROWSER_BINARY = os.getenv("BROWSER_BINARY")
+# 持久化浏览器 profile 目录，登录态保存在其中，下次刷新可跳过登录表单
+BROWSER_PROFILE_DIR = os.getenv("BROWSER_PROFILE_DIR")
+# 判断已有登录态时等待页面跳转的秒数
+SESSION_CHECK_TIMEOUT = float(os.getenv("SESSION_CHECK_TIMEOUT", "5"))
+
+# 上传请求超时（秒）
+UPLOAD_TIMEOUT = float(os.getenv("UPLOAD_TIMEOUT", "30"))
+
+# 非默认账号的本地 cookies 目录
+LOCAL_ACCOUNTS_COOKIES_DIR = "cookies"
+
+_META_LOCK = threading.Lock()
+
+# Cookie 列表（已解析）
+LOGIN_COOKIES = [
+    {'name': 'OptanonAlertBoxClosed', 'value': '2025-08-30T08:32:13.551Z', 'domain': 'www.blablalink.com', 'path': '/'},
+    {'name': '__ss_storage_cookie_cache_game_id__', 'value': '29080', 'domain': 'www.blablalink.com', 'path': '/'},
+    {'name': '__ss_storage_cookie_cache_lang__', 'value': 'zh-TW', 'domain': 'www.blablalink.com', 'path': '/'},
+]
+
+
+def load_account(file_path):
+    with open(file_path, 'r') as f:
+        dic = json.load(f)
+    return dic["EMAIL"], dic["PASSWORD"]
+
+
+# account.json 中可配置 "ACCOUNTS": [{"NAME": ..., "EMAIL": ..., "PASSWORD": ...}]，
+# 未配置时使用顶层的 EMAIL / PASSWORD 作为默认账号。返回 [(name, email, password)]
+def load_accounts(file_path):
+    with open(file_path, 'r') as f:
+        dic = json.load(f)
+    if dic.get("ACCOUNTS"):
+        return [(item["NAME"], item["EMAIL"], item["PASSWORD"]) for item in dic["ACCOUNTS"]]
+    return [(DEFAULT_ACCOUNT, dic["EMAIL"], dic["PASSWORD"])]
+
+
+def load_server(file_path):
+    with open(file_path, 'r') as f:
+        dic = json.load(f)
+    server = os.getenv("SERVER") or dic["SERVER"]
+    port = os.getenv("PORT") or dic["PORT"]
+    return server, port
+
+
+# selenium 只在真正需要浏览器时才导入，读取本地 cookies、上传等不需要启动浏览器的路径不会加载它
+def create_driver(headless=False, profile_dir=None):
+    from selenium import webdriver
+
+    if BROWSER == "chrome":
+        from selenium.webdriver.chrome.service import Service as ChromeService
+
+        options = webdriver.ChromeOptions()
+        service_cls, driver_cls = ChromeService, webdriver.Chrome
+    else:
+        from selenium.webdriver.edge.service import Service
+
+        options = webdriver.EdgeOptions()
+        service_cls, driver_cls = Service, webdriver.Edge
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1280,900")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+    if BROWSER_BINARY:
+        options.binary_location = BROWSER_BINARY
+
+    # 使用本地驱动路径，未配置时由 selenium manager 自动管理驱动
+    service = service_cls(executable_path=WEBDRIVER_PATH) if WEBDRIVER_PATH else service_cls()
+
+    # 启动浏览器
+    return driver_cls(service=service, options=options)
+
+
+# clear_session: 清理浏览器中已有的登录态。只用于浏览器池中复用的浏览器，持久化 profile 的登录态需要保留
+def _add_login_cookies(driver, clear_session=False):
+    # 必须先访问目标域名，才能设置同源 Cookie
+    driver.get(f"{WEB_URL}/")
+
+    # 复用的浏览器可能残留上一个账号的登录态，先清理
+    if clear_session:
+        driver.delete_all_cookies()
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+
+    # 添加每个 cookie
+    for cookie in LOGIN_COOKIES:
+        try:
+            # 移除 domain 字段（有时会导致 InvalidCookieDomainException）
+            safe_cookie = cookie.copy()
+            if 'domain' in safe_cookie:
+                del safe_cookie['domain']
+            driver.add_cookie(safe_cookie)
+            _LOGGER.info(f"成功添加 Cookie: {safe_cookie['name']}")
+        except Exception as e:
+            _LOGGER.info(f"无法添加 Cookie {cookie.get('name', 'unknown')}: {e}")
+
+
+# 打开登录页，若 profile 中的登录态仍有效（页面跳离登录页），则无需重新登录。
+# 登录表单可能先于已有登录态的跳转渲染出来，所以只以 SESSION_CHECK_TIMEOUT 内是否跳转为准
+def _is_logged_in(driver):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.wait import WebDriverWait
+
+    driver.get(LOGIN_URL)
+    try:
+        WebDriverWait(driver, SESSION_CHECK_TIMEOUT).until(lambda d: "/login" not in d.current_url)
+    except TimeoutException:
+        return False
+    return True
+
+
+def _type_text(element, text, delay_range):
+    if not delay_range:
+        element.send_keys(text)
+        return
+    # 模拟人类输入速度
+    for char in text:
+        element.send_keys(char)
+        time.sleep(random.uniform(*delay_range))
+
+
+def _login_with_form(driver, username, password, human_typing=True):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.wait import WebDriverWait
+
+    # 直接跳转到登录页或目标页（Cookie 已生效）
+    if "/login" not in driver.current_url:
+        driver.get(LOGIN_URL)
+
+    wait = WebDriverWait(driver, 30)
+
+    # ========== 1. 输入账号 ==========
+    email_input = wait.until(
+        EC.presence_of_element_located((By.ID, "loginPwdForm_account"))
+    )
+    email_input.clear()
+    _type_text(email_input, username, (0.05, 0.2) if human_typing else None)
+
+    # ========== 2. 输入密码 ==========
+    password_input = wait.until(
+        EC.presence_of_element_located((By.ID, "loginPwdForm_password"))
+    )
+    password_input.clear()
+    _type_text(password_input, password, (0.08, 0.25) if human_typing else None)
+
+    # ========== 3. 点击登录按钮（使用 name 属性，最稳定）==========
+    login_button = wait.until(
+        EC.element_to_be_clickable((By.XPATH, '//button[@name="confirm" and @type="submit"]'))
+    )
+
+    # 记录当前url
+    old_url = driver.current_url
+
+    # 可加一点停顿，模拟思考
+    if human_typing:
+        time.sleep(random.uniform(0.5, 1.5))
+    login_button.click()
+
+    # ========== 4. 等待登录成功 ==========
+    _LOGGER.info("🔍 正在等待登录完成...")
+    try:
+        # 修改此处：根据你登录后跳转的页面调整 URL 关键词
+        wait.until(EC.url_changes(old_url))
+        _LOGGER.info("✅ 登录成功！已跳转到主页。")
+    except TimeoutException:
+        _LOGGER.error("❌ 登录失败或出现验证码。")
+        raise
+
+
+# headless: 无头模式运行；profile_dir: 持久化 profile 目录，登录态有效时跳过登录表单；
+# human_typing: 是否逐字符模拟人类输入；driver: 复用已有浏览器（由调用方负责关闭）
+def login(username, password, headless=False, profile_dir=BROWSER_PROFILE_DIR, human_typing=True, driver=None):
+    own_driver = driver is None
+    if own_driver:
+        driver = create_driver(headless=headless, profile_dir=profile_dir)
+    try:
+        if own_driver and profile_dir and _is_logged_in(driver):
+            _LOGGER.info("✅ 浏览器 profile 中的登录态仍有效，跳过登录表单")
+        else:
+            _add_login_cookies(driver, clear_session=not own_driver)
+            _login_with_form(driver, username, password, human_typing=human_typing)
+
+        # ========== 5. 获取 Cookies ==========
+        cookies = driver.get_cookies()
+        _LOGGER.info(f"🔐 成功获取 {len(cookies)} 个 Cookies：")
+        for cookie in cookies:
+            _LOGGER.info(f"  {cookie['name']}")
+        return cookies
+    except Exception as e:
+        _LOGGER.error(f"发生错误: {e}")
+        raise
+    finally:
+        if own_driver:
+            driver.quit()
+
+
+def format_cookies(ret_cookies):
+    return {cookie['name']: cookie['value'] for cookie in ret_cookies}
+
+
+# 本地保存的账号 cookies 路径，默认账号沿用 cookies.json
+def get_local_cookies_path(account):
+    if account == DEFAULT_ACCOUNT:
+        return COOKIES_FILE_PATH
+    return os.path.join(LOCAL_ACCOUNTS_COOKIES_DIR, f"{account}.json")
+
+
+def save_local_cookies(account, formated_cookies):
+    filepath = get_local_cookies_path(account)
+    COOKIE_STORE.save(filepath, formated_cookies)
+    return filepath
+
+
+def load_cookies_meta():
+    if not os.path.exists(COOKIES_META_FILE_PATH):
+        return {}
+    with open(COOKIES_META_FILE_PATH, 'r') as f:
+        return json.load(f)
+
+
+# 保存刷新时间和每个 cookie 的过期时间（selenium 返回的 expiry，unix 秒），会话 cookie 没有 expiry
+def save_cookies_meta(account, ret_cookies):
+    with _META_LOCK:
+        meta = load_cookies_meta()
+        meta[account] = {
+            "refreshed_at": time.time(),
+            "expiry": {cookie['name']: cookie['expiry'] for cookie in ret_cookies if 'expiry' in cookie},
+        }
+        atomic_write_json(COOKIES_META_FILE_PATH, meta, indent=2)
+        return meta[account]
+
+
+def refresh_cookies(refresh=True, headless=False, profile_dir=BROWSER_PROFILE_DIR, human_typing=True):
+    _LOGGER.info("开始刷新 Cookies...")
+    formated_cookies = None
+    if refresh:
+        _LOGGER.info("正在登录，远程获取Cookies...")
+        username, password = load_account(ACCOUNT_FILE_PATH)
+        ret_cookies = login(username, password, headless=headless, profile_dir=profile_dir,
+                            human_typing=human_typing)
+        formated_cookies = format_cookies(ret_cookies)
+        save_local_cookies(DEFAULT_ACCOUNT, formated_cookies)
+        save_cookies_meta(DEFAULT_ACCOUNT, ret_cookies)
+    else:
+        _LOGGER.info("正在本地读取 Cookies...")
+        formated_cookies = COOKIE_STORE.load(COOKIES_FILE_PATH)
+    return formated_cookies
+
+
+# 通过 SSH 隧道上传到服务器；同一进程内的多次上传复用同一条隧道和 keep-alive 连接
+def upload_json(json_dict, path="/upload_cookies"):
+    server, port = load_server(ACCOUNT_FILE_PATH)
+    tunnel = get_tunnel(server, port)
+    upload_url = f"{tunnel.base_url}{path}"
+    ret = get_session().post(upload_url, json=json_dict, timeout=UPLOAD_TIMEOUT)
+    ret.raise_for_status()
+    json_ret = ret.json()
+    _LOGGER.info(f"结果: {json_ret}")
+    return json_ret
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler()])
+    parser = argparse.ArgumentParser(description="登录并刷新 Cookies，上传到服务器")
+    parser.add_argument("--headless", action="store_true", help="无头模式运行浏览器")
+    parser.add_argument("--profile-dir", default=BROWSER_PROFILE_DIR, help="持久化浏览器 profile 目录")
+    parser.add_argument("--fast", action="store_true", help="不模拟人类输入速度")
+    args = parser.parse_args()
+
+    ret = refresh_cookies(refresh=True, headless=args.headless, profile_dir=args.profile_dir,
+                          human_typing=not args.fast)
+    upload_json(ret)
@@ -0,0 +1,405 @@
+import argparse
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import requests
+from requests import JSONDecodeError
+from requests.cookies import RequestsCookieJar, extract_cookies_to_jar
+
+from .common import DEFAULT_ACCOUNT, LazyPayload, get_payload_logger, load_cookies, parse_headers
+from .deadline import Deadline
+from .feed_index import FeedIndex
+from .metrics import SLEEP_SECONDS, UPSTREAM_API_ERRORS, UPSTREAM_LATENCY, UPSTREAM_REQUESTS
+from .pacing import PACER, Pacer
+from .retry import get_breaker, get_retry_policy, is_transient_error
+from .tracing import span, trace_run
+from .transport import get_session
+
+_LOGGER = logging.getLogger(__name__)
+# 请求/响应内容单独记录，可通过 PAYLOAD_LOG_LEVEL / PAYLOAD_LOG_SAMPLE_RATE 降低多账号并发时的日志量
+_PAYLOAD_LOGGER = get_payload_logger(__name__)
+
+main_h = '''
+Host: api.blablalink.com
+Connection: keep-alive
+Content-Length: 100
+sec-ch-ua-platform: "Windows"
+x-channel-type: 2
+sec-ch-ua: "Chromium";v="140", "Not=A?Brand";v="24", "Microsoft Edge";v="140"
+sec-ch-ua-mobile: ?0
+x-language: zh-TW
+x-common-params: {"game_id":"16","area_id":"global","source":"pc_web","intl_game_id":"29080","language":"zh-TW","env":"prod","data_statistics_scene":"outer","data_statistics_page_id":"https://www.blablalink.com/","data_statistics_client_type":"pc_web","data_statistics_lang":"zh-TW"}
+User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36 Edg/140.0.0.0
+Accept: application/json, text/plain, */*
+DNT: 1
+Content-Type: application/json
+Origin: https://www.blablalink.com
+Sec-Fetch-Site: same-site
+Sec-Fetch-Mode: cors
+Sec-Fetch-Dest: empty
+Referer: https://www.blablalink.com/
+Accept-Encoding: gzip, deflate, br, zstd
+Accept-Language: zh-CN,zh;q=0.9,en-US;q=0.8,en;q=0.7
+'''
+
+mission_h = '''
+Host: api.blablalink.com
+Connection: keep-alive
+Pragma: no-cache
+Cache-Control: no-cache
+sec-ch-ua-platform: "Windows"
+x-channel-type: 2
+sec-ch-ua: "Chromium";v="140", "Not=A?Brand";v="24", "Microsoft Edge";v="140"
+sec-ch-ua-mobile: ?0
+x-language: zh-TW
+x-common-params: {"game_id":"16","area_id":"global","source":"pc_web","intl_game_id":"29080","language":"zh-TW","env":"prod","data_statistics_scene":"outer","data_statistics_page_id":"https://www.blablalink.com/mission","data_statistics_client_type":"pc_web","data_statistics_lang":"zh-TW"}
+User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36 Edg/140.0.0.0
+Accept: application/json, text/plain, */*
+DNT: 1
+Origin: https://www.blablalink.com
+Sec-Fetch-Site: same-site
+Sec-Fetch-Mode: cors
+Sec-Fetch-Dest: empty
+Referer: https://www.blablalink.com/
+Accept-Encoding: gzip, deflate, br, zstd
+Accept-Language: zh-CN,zh;q=0.9,en-US;q=0.8,en;q=0.7
+'''
+
+
+# 可通过环境变量指向本地的替身服务（见 mock_blablalink.py）
+API_HOST = os.getenv("BLABLALINK_API_URL", "https://api.blablalink.com").rstrip("/")
+
+FEED_RECOMMEND = "recommend"
+
+
+# 接口返回了非 0 的 code
+class ApiResponseError(Exception):
+    def __init__(self, message, data=None):
+        super().__init__(message)
+        self.data = data
+
+
+class BlablaLinkReader:
+    def __init__(self, cookies=None, pacer: Pacer | None = None, account=DEFAULT_ACCOUNT,
+                 feed_index: FeedIndex | None = None, deadline: Deadline | None = None):
+        self.cookies = cookies or load_cookies()
+        self.pacer = pacer or PACER
+        # 本次运行的时间预算，默认不限时（单次请求仍有 HTTP_TIMEOUT 超时）
+        self.deadline = deadline or Deadline()
+        self.account = account
+        # 可选的帖子索引，用于跳过已点赞帖子并从上次的游标继续翻页
+        self.feed_index = feed_index
+        self.next_cursor = None
+        self.host = API_HOST
+        self.headers = parse_headers(main_h)
+        self.mission_headers = parse_headers(mission_h)
+        if urlsplit(self.host).netloc != self.headers.get("Host"):
+            # 指向替身服务时不再固定 Host 头，由 requests 按实际地址生成
+            self.headers.pop("Host", None)
+            self.mission_headers.pop("Host", None)
+        self.session: requests.Session | None = None
+        # 本次运行的上游错误计数，键为 "接口:错误类型"（如 GetPost:http_503、DailyCheckIn:code_1001）
+        self.upstream_errors = Counter()
+        self._errors_lock = threading.Lock()
+        self.cookie_jar: RequestsCookieJar | None = None
+
+    def init_session(self):
+        # 复用进程级连接池，本账号的 cookie 单独保存在 cookie_jar 中，每次请求时带上
+        self.session = get_session()
+        self.cookie_jar = RequestsCookieJar()
+        self.cookie_jar.update(self.cookies)
+
+        _LOGGER.info(f"初始化session成功")
+
+    # 响应体只解码一次，解析结果直接向下传递；非 JSON 响应返回原始文本
+    @staticmethod
+    def _decode_response(resp: requests.Response):
+        try:
+            return resp.json()
+        except JSONDecodeError:
+            return resp.text
+
+    @staticmethod
+    def _endpoint(url):
+        return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+    def _count_error(self, endpoint, kind):
+        with self._errors_lock:
+            self.upstream_errors[f"{endpoint}:{kind}"] += 1
+
+    def _pace(self, url):
+        # 通过全局 pacer 按 host 限速，代替每次请求后的随机 sleep；等待时间计入本次运行的时间预算
+        delay = self.pacer.reserve(urlsplit(url).netloc)
+        if delay > 0:
+            with span("sleep pacing", "sleep", seconds=round(delay, 3)):
+                self.deadline.sleep(delay, message="限速等待")
+            SLEEP_SECONDS.inc(delay, kind="pacing")
+
+    def _send(self, method, url, headers, pace, **kwargs):
+        if pace:
+            self._pace(url)
+        kwargs.setdefault("timeout", self.deadline.timeout())
+        _PAYLOAD_LOGGER.info("%s 请求: %s, %s", method, url, LazyPayload(kwargs))
+        endpoint = self._endpoint(url)
+        start = time.perf_counter()
+        try:
+            with span(f"http {endpoint}", "http", method=method) as span_args:
+                ret: requests.Response = self.session.request(method, url, headers=headers or self.headers,
+                                                              cookies=self.cookie_jar, **kwargs)
+                span_args["status"] = ret.status_code
+        except requests.RequestException as e:
+            UPSTREAM_REQUESTS.inc(endpoint=endpoint, status="error")
+            self._count_error(endpoint, type(e).__name__)
+            raise
+        finally:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+        UPSTREAM_REQUESTS.inc(endpoint=endpoint, status=ret.status_code)
+        if ret.status_code >= 400:
+            self._count_error(endpoint, f"http_{ret.status_code}")
+        # 共享 session 不保存 cookie，服务端下发的 cookie 写回本账号的 cookie_jar
+        extract_cookies_to_jar(self.cookie_jar, ret.request, ret.raw)
+        ret.raise_for_status()
+        with span(f"json_decode {endpoint}", "decode", size=len(ret.content)):
+            data = self._decode_response(ret)
+        _PAYLOAD_LOGGER.info("%s 结果: %s", method, LazyPayload(data))
+        return data
+
+    # 返回解码后的响应体（dict 或 str）
+    def session_post(self, url, *, headers=None, pace=True, **kwargs):
+        return self._send("POST", url, headers, pace, **kwargs)
+
+    def session_get(self, url, *, headers=None, pace=True, **kwargs):
+        return self._send("GET", url, headers, pace, **kwargs)
+
+    @staticmethod
+    def _check_api_result(data, message):
+        if not isinstance(data, dict) or data.get("code") != 0:
+            raise ApiResponseError(f"{message}失败: {LazyPayload(data)}", data)
+        return data
+
+    # 按接口的重试策略调用，暂时性故障计入按 host 共享的熔断器；重试等待计入时间预算。
+    # 接口返回非 0 code 是业务上的拒绝（如游标失效），重试也不会改变结果，直接抛出 ApiResponseError
+    def _call_api(self, method, url, message, headers, **kwargs):
+        policy = get_retry_policy(url)
+        breaker = get_breaker(urlsplit(url).netloc)
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker.before_call()
+            try:
+                data = self._send(method, url, headers, True, **kwargs)
+            except requests.RequestException as e:
+                if is_transient_error(e):
+                    breaker.record_failure()
+                else:
+                    breaker.release()
+                if not policy.should_retry(e, attempt):
+                    raise
+                error = e
+            except BaseException:
+                # 限速等待或请求前超出时间预算等未得出结论的情况，也要释放试探名额，否则熔断器无法恢复
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                try:
+                    return self._check_api_result(data, message)
+                except ApiResponseError:
+                    code = data.get("code") if isinstance(data, dict) else "invalid"
+                    UPSTREAM_API_ERRORS.inc(endpoint=self._endpoint(url), code=code)
+                    self._count_error(self._endpoint(url), f"code_{code}")
+                    raise
+            delay = policy.delay(attempt)
+            _LOGGER.warning(f"{message}失败，{delay:.2f} 秒后第 {attempt + 1} 次尝试: {error}")
+            with span("sleep retry", "sleep", seconds=round(delay, 3), attempt=attempt):
+                self.deadline.sleep(delay, message="重试等待")
+            SLEEP_SECONDS.inc(delay, kind="retry")
+
+    def api_post(self, url, json_data, message="请求", headers=None):
+        return self._call_api("POST", url, message, headers, json=json_data)
+
+    def api_get(self, url, params=None, message="请求", headers=None):
+        return self._call_api("GET", url, message, headers, params=params)
+
+    def _fetch_post_page(self, cursor, page):
+        url = self.host + "/api/ugc/direct/standalonesite/Dynamics/GetPostList"
+        # json_data = {"search_type": 0, "plate_id": 46, "plate_unique_id": "recommend", "order_by": 2, "limit": "10",
+        #              "regions": []}
+        limit_num = 10
+        json_data = {
+            "search_type": 0,
+            "plate_id": 46,
+            "plate_unique_id": FEED_RECOMMEND,
+            "order_by": 2,
+            "limit": str(limit_num),
+            "regions": ["en", "ja", "ko", "zh-TW"]
+        }
+        if cursor:
+            # "nextPageCursor": "1494c8c443fcf906792fdf4c76854bf1fb9a1cc7764a7326d7de759e991a6e1e",
+            json_data["nextPageCursor"] = cursor
+        with span(f"list_page {page + 1}", "step"):
+            json_ret = self.api_post(url, json_data, message=f"获取列表第{page + 1}页")
+        next_cursor = json_ret["data"]["page_info"]["next_page_cursor"]
+        posts = [self._parse_post(post_data) for post_data in json_ret["data"].get("list", [])]
+        return posts, next_cursor
+
+    # 流式获取帖子：每翻到一页就立即产出本页符合条件的帖子 (uuid, title, is_liked)，
+    # 调用方停止迭代后不再继续翻页。最后一次的 next_page_cursor 记录在 self.next_cursor
+    def iter_posts(self, filter_is_liked=None, start_cursor=None, max_page=10):
+        # 未指定起始游标时，从索引中记录的上次游标继续翻页
+        resumed = False
+        if start_cursor is None and self.feed_index is not None:
+            start_cursor = self.feed_index.get_cursor(self.account, FEED_RECOMMEND)
+            resumed = start_cursor is not None
+        next_cursor = start_cursor
+        seen = set()
+        for page in range(max_page):
+            if not next_cursor and page > 0:
+                raise Exception("nextPageCursor is None")
+            page_cursor = next_cursor
+            try:
+                posts, next_cursor = self._fetch_post_page(page_cursor, page)
+            except ApiResponseError as e:
+                if not (resumed and page == 0):
+                    raise
+                # 接口拒绝了保存的游标（已失效），清除后从头开始；超时、熔断等其他错误直接抛出，保留游标
+                _LOGGER.warning(f"从保存的游标继续获取列表失败，从头开始: {e}")
+                self.feed_index.clear_cursor(self.account, FEED_RECOMMEND)
+                resumed = False
+                page_cursor = None
+                posts, next_cursor = self._fetch_post_page(None, page)
+            self.next_cursor = next_cursor
+            known_liked = set()
+            if self.feed_index is not None:
+                known_liked = self.feed_index.liked_uuids(self.account, [uuid for uuid, _, _ in posts])
+                self.feed_index.record_posts(self.account, posts)
+                # 记录本页的起始游标，下次从本页开始，本页未用到的帖子不会被跳过
+                if page_cursor:
+                    self.feed_index.save_cursor(self.account, FEED_RECOMMEND, page_cursor)
+            for uuid, title, is_liked in posts:
+                is_liked = is_liked or str(uuid) in known_liked
+                if filter_is_liked is not None and filter_is_liked != is_liked:
+                    continue
+                if uuid in seen:
+                    continue
+                seen.add(uuid)
+                yield uuid, title, is_liked
+            if not next_cursor:
+                # 已翻到底，下次从头开始
+                if self.feed_index is not None:
+                    self.feed_index.clear_cursor(self.account, FEED_RECOMMEND)
+                return
+
+    def list_post(self, want=20, filter_is_liked=None, start_cursor=None, max_page=10):
+        post_list = []
+        self.next_cursor = start_cursor
+        for post in self.iter_posts(filter_is_liked=filter_is_liked, start_cursor=start_cursor, max_page=max_page):
+            post_list.append(post)
+            if len(post_list) >= want:
+                break
+        if len(post_list) < want:
+            raise Exception(f"获取列表失败, 结果数量不足, want={want}, get={len(post_list)}, max_page={max_page}")
+        _PAYLOAD_LOGGER.info("获取列表成功，%s", LazyPayload(post_list))
+        return post_list, self.next_cursor
+
+    @staticmethod
+    def _is_post_liked(post_data):
+        my_upvote = post_data.get("my_upvote", {})
+        if my_upvote:
+            return bool(my_upvote["is_star"])
+        return False
+
+    def _parse_post(self, post_data):
+        uuid = post_data["post_uuid"]
+        title = post_data["title"]
+        is_liked = self._is_post_liked(post_data)
+        return uuid, title, is_liked
+
+    def like_post(self, uuid):
+        url = self.host + "/api/ugc/proxy/standalonesite/Dynamics/PostStar"
+        json_data = {
+            "post_uuid": str(uuid),
+            "type": 1,
+            "like_type": 1
+        }
+        json_ret = self.api_post(url, json_data, message="点赞帖子")
+        if self.feed_index is not None:
+            self.feed_index.mark_liked(self.account, uuid)
+        _LOGGER.info(f"点赞成功: {uuid}")
+        return json_ret
+
+    def read_post(self, uuid):
+        url = self.host + "/api/ugc/direct/standalonesite/Dynamics/GetPost"
+        # {"post_uuid":"6438288651724120935","browse_post":2,"original_content":0}
+        json_data = {
+            "post_uuid": str(uuid),
+            "browse_post": 2,
+            "original_content": 0
+        }
+        json_ret = self.api_post(url, json_data, message="阅读帖子")
+        _LOGGER.info(f"获取帖子成功: {uuid}")
+        return json_ret
+
+    def check_in(self):
+        url = self.host + "/api/lip/proxy/lipass/Points/DailyCheckIn"
+        # {"task_id": "15"}
+        json_data = {"task_id": "15"}
+        json_ret = self.api_post(url, json_data, message="签到")
+        _LOGGER.info("签到成功")
+        return json_ret
+
+    # 获取积分任务列表（原始任务数据）
+    def get_task_list(self):
+        url = self.host + "/api/lip/proxy/lipass/Points/GetTaskListWithStatusV2"
+        # ?get_top=false&intl_game_id=29080
+        params = {
+            "get_top": False,
+            "intl_game_id": 29080
+        }
+        json_ret = self.api_get(url, params=params, message="获取任务状态", headers=self.mission_headers)
+        return json_ret["data"].get("tasks", [])
+
+    @staticmethod
+    def is_task_completed(task_data):
+        return bool(task_data["reward_infos"][0]["is_completed"])
+
+    # is_required: 可选的判断函数，只要求其返回 True 的任务已完成，默认要求全部任务
+    def check_task_finished(self, is_required=None):
+        task_status_list = []
+        unfinished_task_list = []
+        for task_data in self.get_task_list():
+            task_name = task_data["task_name"]
+            task_status = self.is_task_completed(task_data)
+            task_status_list.append((task_name, task_status))
+            if not task_status and (is_required is None or is_required(task_data)):
+                unfinished_task_list.append(task_name)
+        _LOGGER.info(f"任务状态: {task_status_list}")
+        if unfinished_task_list:
+            raise Exception(f"任务未完成: {unfinished_task_list}")
+        return task_status_list
+
+    def get_total_reward(self):
+        url = self.host + "/api/lip/proxy/lipass/Points/GetUserTotalPoints"
+        json_ret = self.api_get(url, message="获取总积分", headers=self.mission_headers)
+        _LOGGER.info(f"获取总积分成功: {json_ret['data']['total_points']}")
+        return json_ret["data"]["total_points"]
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler()])
+    parser = argparse.ArgumentParser(description="检查积分任务状态并查询总积分")
+    parser.add_argument("--trace", action="store_true", help="记录本次运行的时间线，保存为 Chrome trace 文件")
+    parser.add_argument("--profile", action="store_true", help="同时使用 cProfile 统计（结果写入 trace 文件）")
+    args = parser.parse_args()
+
+    reader = BlablaLinkReader()
+    reader.init_session()
+
+    with trace_run("reader", enabled=args.trace, profile=args.profile):
+        reader.check_task_finished()
+        reader.get_total_reward()
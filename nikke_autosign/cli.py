@@ -0,0 +1,171 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+# 统一命令行入口：nikke serve / sign / refresh / upload / status。
+# 各子命令只在执行时才导入所需模块，sign、upload、status 不会加载 flask 和 selenium，适合 cron 等短任务
+
+
+def _print_json(data):
+    print(json.dumps(data, ensure_ascii=False, indent=2))
+
+
+def _format_time(ts):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts)) if ts else None
+
+
+def cmd_serve(args):
+    from .web_server import SIGN_SCHEDULER_ENABLED, run_server
+
+    run_server(host=args.host, port=args.port, scheduler=args.scheduler or SIGN_SCHEDULER_ENABLED)
+
+
+def cmd_sign(args):
+    from .notifier import get_notifier
+    from .sign_runner import notify_summary, sign_accounts
+
+    results = sign_accounts(args.accounts or None, max_workers=args.workers, budget=args.budget)
+    _print_json(results)
+    if not args.no_notify:
+        notify_summary(results)
+        get_notifier().flush()
+    return 0 if results and all(result["success"] for result in results) else 1
+
+
+def cmd_refresh(args):
+    from .auto_refresh_cookies import upload_json
+    from .common import ACCOUNT_FILE_PATH
+
+    if args.accounts or args.all:
+        from .auto_refresh_cookies import load_accounts
+        from .refresh_farm import MAX_BROWSERS, refresh_accounts, upload_results
+
+        all_accounts = load_accounts(ACCOUNT_FILE_PATH)
+        if args.accounts:
+            all_accounts = [item for item in all_accounts if item[0] in args.accounts]
+        results = refresh_accounts(all_accounts, max_browsers=args.browsers or MAX_BROWSERS,
+                                   headless=not args.headful)
+        _print_json([{k: v for k, v in result.items() if k != "cookies"} for result in results])
+        if not args.no_upload:
+            upload_results(results)
+        return 0 if all(result["success"] for result in results) else 1
+
+    from .auto_refresh_cookies import BROWSER_PROFILE_DIR, refresh_cookies
+
+    cookies = refresh_cookies(refresh=True, headless=not args.headful,
+                              profile_dir=args.profile_dir or BROWSER_PROFILE_DIR, human_typing=not args.fast)
+    if not args.no_upload:
+        upload_json(cookies)
+    return 0
+
+
+# 上传本地已保存的 cookies，不启动浏览器
+def cmd_upload(args):
+    from .auto_refresh_cookies import get_local_cookies_path, upload_json
+    from .common import DEFAULT_ACCOUNT
+    from .cookie_store import COOKIE_STORE
+
+    path = args.file or get_local_cookies_path(args.account)
+    cookies = COOKIE_STORE.load(path)
+    if args.account == DEFAULT_ACCOUNT:
+        ret = upload_json(cookies)
+    else:
+        ret = upload_json(cookies, path=f"/upload_cookies?account={args.account}")
+    _print_json(ret)
+    return 0
+
+
+# 本地状态：已上传的账号、cookies 过期与下次刷新时间、调度器记录的最近成功签到、运行历史统计
+def cmd_status(args):
+    from .auto_refresh_cookies import load_cookies_meta
+    from .common import list_accounts
+    from .cookie_scheduler import earliest_expiry, next_refresh_at
+    from .run_history import open_run_history_readonly
+    from .sign_scheduler import SIGN_STATE_PATH
+
+    meta = load_cookies_meta()
+    sign_state = {}
+    if os.path.exists(SIGN_STATE_PATH):
+        with open(SIGN_STATE_PATH, "r", encoding="utf-8") as f:
+            sign_state = json.load(f)
+    # 只读查询运行历史，不创建数据库、不清理旧记录
+    history = open_run_history_readonly()
+    stats = {}
+    if history is not None:
+        try:
+            stats = history.stats(since=time.time() - args.days * 86400)
+        finally:
+            history.close()
+
+    status = {}
+    for account in sorted(set(list_accounts()) | set(meta) | set(sign_state) | set(stats)):
+        account_meta = meta.get(account, {})
+        status[account] = {
+            "cookies_refreshed_at": _format_time(account_meta.get("refreshed_at")),
+            "cookies_expire_at": _format_time(earliest_expiry(account_meta)) if account_meta else None,
+            "next_refresh_at": _format_time(next_refresh_at(account_meta)) if account_meta else None,
+            "last_success": _format_time(sign_state.get(account, {}).get("last_success")),
+            "last_error": sign_state.get(account, {}).get("last_error"),
+            "runs": stats.get(account) or "暂无运行记录",
+        }
+    _print_json(status)
+    return 0
+
+
+def build_parser():
+    from .common import DEFAULT_ACCOUNT
+    from .deadline import SIGN_BUDGET
+
+    parser = argparse.ArgumentParser(prog="nikke", description="Nikke 自动签到")
+    parser.add_argument("-v", "--verbose", action="store_true", help="输出 DEBUG 日志")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="启动 Web 服务")
+    serve.add_argument("--host", default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=5000)
+    serve.add_argument("--scheduler", action="store_true", help="同时启动内置签到调度器")
+    serve.set_defaults(func=cmd_serve)
+
+    sign = subparsers.add_parser("sign", help="签到（默认全部账号）")
+    sign.add_argument("accounts", nargs="*", help="要签到的账号，默认全部")
+    sign.add_argument("--workers", type=int, default=None, help="并发线程数")
+    sign.add_argument("--budget", type=float, default=SIGN_BUDGET, help="每个账号的签到时间预算（秒）")
+    sign.add_argument("--no-notify", action="store_true", help="不发送通知")
+    sign.set_defaults(func=cmd_sign)
+
+    refresh = subparsers.add_parser("refresh", help="登录刷新 Cookies 并上传")
+    refresh.add_argument("accounts", nargs="*", help="要刷新的账号名（account.json 中的 NAME），默认只刷新默认账号")
+    refresh.add_argument("--all", action="store_true", help="刷新 account.json 中的全部账号")
+    refresh.add_argument("--browsers", type=int, default=None, help="多账号刷新时同时运行的浏览器数")
+    refresh.add_argument("--headful", action="store_true", help="显示浏览器窗口")
+    refresh.add_argument("--profile-dir", default=None, help="持久化浏览器 profile 目录，默认取 BROWSER_PROFILE_DIR")
+    refresh.add_argument("--fast", action="store_true", help="不模拟人类输入速度")
+    refresh.add_argument("--no-upload", action="store_true", help="只刷新不上传")
+    refresh.set_defaults(func=cmd_refresh)
+
+    upload = subparsers.add_parser("upload", help="上传本地已保存的 Cookies（不启动浏览器）")
+    upload.add_argument("--account", default=DEFAULT_ACCOUNT, help="账号名")
+    upload.add_argument("--file", default=None, help="Cookies 文件路径，默认为该账号的本地 cookies 文件")
+    upload.set_defaults(func=cmd_upload)
+
+    status = subparsers.add_parser("status", help="查看各账号 Cookies 和签到状态")
+    status.add_argument("--days", type=int, default=7, help="运行历史统计的天数")
+    status.set_defaults(func=cmd_status)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # serve 使用带文件输出的日志配置（在 run_server 中设置），其余子命令只输出到控制台
+    if args.command != "serve":
+        from .logging_setup import setup_logging
+
+        setup_logging(level=logging.DEBUG if args.verbose else logging.INFO, log_file=None)
+    return args.func(args) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import random
+import re
+
+from .cookie_store import COOKIE_STORE
+
+COOKIES_FILE_PATH = "cookies.json"
+UPLOAD_COOKIES_FILE_PATH = "upload/cookies.json"
+ACCOUNT_FILE_PATH = "account.json"
+SEND_KEY_FILE_PATH = "send_key.json"
+# Cookies 元数据（刷新时间、各 cookie 的过期时间），按账号保存
+COOKIES_META_FILE_PATH = "cookies_meta.json"
+# 多账号 Cookies 目录，每个账号一个 <account>.json
+ACCOUNTS_COOKIES_DIR = "upload/accounts"
+# 默认账号，对应旧的 upload/cookies.json
+DEFAULT_ACCOUNT = "default"
+
+# 日志中单个 payload 的最大字符数，超出部分截断
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "1000"))
+# 请求/响应 payload 日志单独使用 <模块名>.payload logger，可单独设置级别和采样率（0~1）；
+# 未设置级别时沿用 root logger 的级别
+PAYLOAD_LOG_LEVEL = os.getenv("PAYLOAD_LOG_LEVEL", "").upper()
+PAYLOAD_LOG_SAMPLE_RATE = float(os.getenv("PAYLOAD_LOG_SAMPLE_RATE", "1"))
+
+_ACCOUNT_NAME_RE = re.compile(r"^[\w.@-]+$")
+
+
+# 惰性日志参数：只有日志真正输出时才序列化并截断，配合 _LOGGER.info("...%s", LazyPayload(data)) 使用
+class LazyPayload:
+    __slots__ = ("payload", "max_chars")
+
+    def __init__(self, payload, max_chars=None):
+        self.payload = payload
+        self.max_chars = LOG_PAYLOAD_MAX_CHARS if max_chars is None else max_chars
+
+    def __str__(self):
+        if isinstance(self.payload, str):
+            text = self.payload
+        else:
+            try:
+                text = json.dumps(self.payload, ensure_ascii=False, default=str)
+            except (TypeError, ValueError):
+                text = str(self.payload)
+        if 0 <= self.max_chars < len(text):
+            return f"{text[:self.max_chars]}...(共{len(text)}字符，已截断)"
+        return text
+
+
+# 按比例随机保留日志，WARNING 及以上始终保留
+class SampleFilter(logging.Filter):
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or self.rate >= 1 or random.random() < self.rate
+
+
+def get_payload_logger(name, level=PAYLOAD_LOG_LEVEL, sample_rate=PAYLOAD_LOG_SAMPLE_RATE):
+    logger = logging.getLogger(f"{name}.payload")
+    if level:
+        logger.setLevel(level)
+    if sample_rate < 1 and not any(isinstance(f, SampleFilter) for f in logger.filters):
+        logger.addFilter(SampleFilter(sample_rate))
+    return logger
+
+
+def parse_headers(header_str):
+    headers = {}
+    for line in header_str.splitlines():
+        if not line.strip():
+            continue
+        if ':' in line:
+            key, value = line.split(':', 1)
+            headers[key.strip()] = value.strip()  # ← 关键：value.strip()
+    return headers
+
+
+# 优先读取本地刷新得到的 cookies.json，否则读取上传的 upload/cookies.json；解析结果由 COOKIE_STORE 缓存
+def load_cookies():
+    if os.path.exists(COOKIES_FILE_PATH):
+        return COOKIE_STORE.load(COOKIES_FILE_PATH)
+    return COOKIE_STORE.load(UPLOAD_COOKIES_FILE_PATH)
+
+
+def is_valid_account_name(account):
+    return bool(account) and bool(_ACCOUNT_NAME_RE.match(account)) and account not in (".", "..")
+
+
+def get_account_cookies_path(account):
+    if not is_valid_account_name(account):
+        raise ValueError(f"账号名不合法: {account}")
+    if account == DEFAULT_ACCOUNT:
+        return UPLOAD_COOKIES_FILE_PATH
+    return os.path.join(ACCOUNTS_COOKIES_DIR, f"{account}.json")
+
+
+def list_accounts():
+    accounts = []
+    if os.path.exists(UPLOAD_COOKIES_FILE_PATH):
+        accounts.append(DEFAULT_ACCOUNT)
+    if os.path.isdir(ACCOUNTS_COOKIES_DIR):
+        for filename in sorted(os.listdir(ACCOUNTS_COOKIES_DIR)):
+            name, ext = os.path.splitext(filename)
+            if ext == ".json" and is_valid_account_name(name) and name != DEFAULT_ACCOUNT:
+                accounts.append(name)
+    return accounts
+
+
+def load_account_cookies(account):
+    return COOKIE_STORE.load(get_account_cookies_path(account))
+
+
+# 原子写入并更新缓存，正在进行的签到不会读到写了一半的文件
+def save_account_cookies(account, cookies):
+    filepath = get_account_cookies_path(account)
+    COOKIE_STORE.save(filepath, cookies)
+    return filepath
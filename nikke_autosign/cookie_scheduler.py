@@ -0,0 +1,103 @@
+import argparse
+import logging
+import os
+import time
+
+from .auto_refresh_cookies import (BROWSER_PROFILE_DIR, format_cookies, load_accounts, load_cookies_meta, login,
+                                  save_cookies_meta, save_local_cookies, upload_json)
+from .common import ACCOUNT_FILE_PATH, DEFAULT_ACCOUNT
+
+_LOGGER = logging.getLogger(__name__)
+
+# 关键 cookie 名称（逗号分隔），为空时寿命不短于 REFRESH_LEAD_SECONDS 的带过期时间的 cookie 都视为关键
+CRITICAL_COOKIES = [name.strip() for name in os.getenv("CRITICAL_COOKIES", "").split(",") if name.strip()]
+# 在最早过期时间之前多久刷新
+REFRESH_LEAD_SECONDS = float(os.getenv("REFRESH_LEAD_SECONDS", str(6 * 3600)))
+# 没有任何过期信息时，距上次刷新多久后再刷新
+REFRESH_MAX_AGE_SECONDS = float(os.getenv("REFRESH_MAX_AGE_SECONDS", str(3 * 24 * 3600)))
+# 刷新失败后的重试间隔
+REFRESH_RETRY_SECONDS = float(os.getenv("REFRESH_RETRY_SECONDS", str(30 * 60)))
+# 两次成功刷新之间的最小间隔，避免过期时间异常时反复登录
+REFRESH_MIN_INTERVAL_SECONDS = float(os.getenv("REFRESH_MIN_INTERVAL_SECONDS", str(30 * 60)))
+# 守护进程最长休眠时间，便于及时感知元数据文件的变化
+POLL_INTERVAL_SECONDS = float(os.getenv("POLL_INTERVAL_SECONDS", "600"))
+
+
+def earliest_expiry(account_meta, critical_cookies=None):
+    critical_cookies = CRITICAL_COOKIES if critical_cookies is None else critical_cookies
+    expiry = account_meta.get("expiry", {})
+    if critical_cookies:
+        expiry = {name: ts for name, ts in expiry.items() if name in critical_cookies}
+    elif "refreshed_at" in account_meta:
+        # 未指定关键 cookie 时忽略寿命短于提前量的 cookie（如 30 分钟的 __cf_bm），否则刷新后会立即再次到期
+        refreshed_at = account_meta["refreshed_at"]
+        expiry = {name: ts for name, ts in expiry.items() if ts - refreshed_at >= REFRESH_LEAD_SECONDS}
+    return min(expiry.values()) if expiry else None
+
+
+# 计算下次应刷新的时间点（unix 秒），没有元数据时立即刷新
+def next_refresh_at(account_meta, critical_cookies=None):
+    if not account_meta:
+        return 0.0
+    refreshed_at = account_meta.get("refreshed_at", 0.0)
+    expiry = earliest_expiry(account_meta, critical_cookies)
+    due_at = expiry - REFRESH_LEAD_SECONDS if expiry is not None else refreshed_at + REFRESH_MAX_AGE_SECONDS
+    return max(due_at, refreshed_at + REFRESH_MIN_INTERVAL_SECONDS)
+
+
+# 登录刷新一个账号并上传。非默认账号使用 profile_dir 下以账号名命名的子目录，各账号的登录态互不覆盖
+def refresh_and_upload(account, email, password, headless=True, profile_dir=BROWSER_PROFILE_DIR):
+    if profile_dir and account != DEFAULT_ACCOUNT:
+        profile_dir = os.path.join(profile_dir, account)
+    ret_cookies = login(email, password, headless=headless, profile_dir=profile_dir, human_typing=False)
+    cookies = format_cookies(ret_cookies)
+    save_local_cookies(account, cookies)
+    save_cookies_meta(account, ret_cookies)
+    if account == DEFAULT_ACCOUNT:
+        upload_json(cookies)
+    else:
+        upload_json(cookies, path=f"/upload_cookies?account={account}")
+
+
+# 守护进程：对 account.json 中的每个账号，在其最早的关键 cookie 过期前刷新并上传；
+# accounts 为要处理的账号名，默认全部；once=True 时只检查一次
+def run_scheduler(once=False, headless=True, profile_dir=BROWSER_PROFILE_DIR, accounts=None):
+    retry_at = {}
+    while True:
+        all_accounts = load_accounts(ACCOUNT_FILE_PATH)
+        if accounts:
+            all_accounts = [item for item in all_accounts if item[0] in accounts]
+        meta = load_cookies_meta()
+        next_due = None
+        for account, email, password in all_accounts:
+            due_at = max(next_refresh_at(meta.get(account, {})), retry_at.get(account, 0.0))
+            if due_at <= time.time():
+                _LOGGER.info(f"[{account}] Cookies 即将过期，开始刷新")
+                try:
+                    refresh_and_upload(account, email, password, headless=headless, profile_dir=profile_dir)
+                    retry_at.pop(account, None)
+                    _LOGGER.info(f"[{account}] Cookies 刷新并上传成功")
+                except Exception as e:
+                    retry_at[account] = time.time() + REFRESH_RETRY_SECONDS
+                    _LOGGER.error(f"[{account}] Cookies 刷新失败，{REFRESH_RETRY_SECONDS:.0f} 秒后重试: {e}")
+                due_at = max(next_refresh_at(load_cookies_meta().get(account, {})), retry_at.get(account, 0.0))
+            _LOGGER.info(f"[{account}] 下次刷新时间: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(due_at))}")
+            next_due = due_at if next_due is None else min(next_due, due_at)
+        if once:
+            return
+        sleep_seconds = POLL_INTERVAL_SECONDS if next_due is None else next_due - time.time()
+        time.sleep(min(max(sleep_seconds, 0.0), POLL_INTERVAL_SECONDS))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler()])
+    parser = argparse.ArgumentParser(description="根据 Cookies 过期时间自动刷新并上传")
+    parser.add_argument("accounts", nargs="*", help="要刷新的账号名（account.json 中的 NAME），默认全部")
+    parser.add_argument("--once", action="store_true", help="只检查一次，到期则刷新后退出")
+    parser.add_argument("--headful", action="store_true", help="显示浏览器窗口")
+    parser.add_argument("--profile-dir", default=BROWSER_PROFILE_DIR, help="持久化浏览器 profile 目录")
+    args = parser.parse_args()
+
+    run_scheduler(once=args.once, headless=not args.headful, profile_dir=args.profile_dir,
+                  accounts=args.accounts)
@@ -0,0 +1,86 @@
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# 原子写入 JSON：先写同目录下的临时文件并 fsync，再 os.replace 覆盖目标文件，
+# 读取方要么看到旧文件、要么看到完整的新文件，不会读到写了一半的内容
+def atomic_write_json(path, data, indent=None):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# 进程内的 cookies 缓存，web_server、reader 和刷新脚本共用。
+# 按文件路径缓存解析结果，文件的 (mtime_ns, size) 变化时才重新读取（其他进程写入的文件同样能感知），
+# 每次内容变化 version 加一；通过 save 写入时原子写盘并直接更新缓存
+class CookieStore:
+    def __init__(self):
+        self._entries = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stamp(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _put(self, path, stamp, cookies):
+        version = self._versions.get(path, 0) + 1
+        self._versions[path] = version
+        self._entries[path] = (stamp, cookies)
+        return version
+
+    # 返回解析后的 cookies 副本；文件不存在时抛出 FileNotFoundError，内容不是 JSON 时抛出 JSONDecodeError
+    def load(self, path):
+        path = os.path.abspath(path)
+        stamp = self._stamp(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                return copy.deepcopy(entry[1])
+        with open(path, "r", encoding="utf-8") as f:
+            cookies = json.load(f)
+        with self._lock:
+            version = self._put(path, stamp, cookies)
+        _LOGGER.debug(f"cookies 已从磁盘加载: {path} (version={version})")
+        return copy.deepcopy(cookies)
+
+    def save(self, path, cookies):
+        path = os.path.abspath(path)
+        cookies = copy.deepcopy(cookies)
+        with self._lock:
+            atomic_write_json(path, cookies)
+            return self._put(path, self._stamp(path), cookies)
+
+    # 当前缓存的版本号，未加载过返回 0
+    def version(self, path):
+        with self._lock:
+            return self._versions.get(os.path.abspath(path), 0)
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+
+COOKIE_STORE = CookieStore()
@@ -0,0 +1,45 @@
+import os
+import time
+
+# 单次 HTTP 请求的默认超时（秒），实际超时不会超过剩余预算
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+# 单个账号一次签到的默认总时间预算（秒）
+SIGN_BUDGET = float(os.getenv("SIGN_BUDGET", "120"))
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+# 一次运行的截止时间。budget 为 None 表示不限时；所有请求超时、限速等待和重试间隔都从剩余时间中扣除
+class Deadline:
+    def __init__(self, budget=None):
+        self.budget = budget
+        self._expire_at = None if budget is None else time.monotonic() + budget
+
+    def remaining(self):
+        if self._expire_at is None:
+            return None
+        return max(0.0, self._expire_at - time.monotonic())
+
+    def expired(self):
+        return self._expire_at is not None and time.monotonic() >= self._expire_at
+
+    def check(self, message="运行"):
+        if self.expired():
+            raise DeadlineExceeded(f"{message}超时，时间预算 {self.budget} 秒已用完")
+
+    # 本次请求可用的超时时间
+    def timeout(self, default=HTTP_TIMEOUT, message="请求"):
+        self.check(message)
+        remaining = self.remaining()
+        return default if remaining is None else min(default, remaining)
+
+    # 等待 seconds 秒；若等待会超出预算则直接抛出 DeadlineExceeded，不做无意义的等待
+    def sleep(self, seconds, message="等待"):
+        if seconds <= 0:
+            return
+        remaining = self.remaining()
+        if remaining is not None and seconds >= remaining:
+            raise DeadlineExceeded(f"{message}超时，剩余时间 {remaining:.2f} 秒不足 {seconds:.2f} 秒")
+        time.sleep(seconds)
@@ -0,0 +1,108 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# 帖子索引数据库：记录见过的帖子、各账号的点赞状态和上次成功的翻页游标
+FEED_INDEX_PATH = os.getenv("FEED_INDEX_PATH", "upload/feed_index.db")
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS posts (
+    uuid TEXT PRIMARY KEY,
+    title TEXT,
+    first_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS likes (
+    account TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    liked INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (account, uuid)
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    account TEXT NOT NULL,
+    feed TEXT NOT NULL,
+    cursor TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (account, feed)
+);
+'''
+
+
+class FeedIndex:
+    def __init__(self, path=FEED_INDEX_PATH):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    # 记录一页帖子，posts 为 (uuid, title, is_liked) 列表
+    def record_posts(self, account, posts):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO posts (uuid, title, first_seen) VALUES (?, ?, ?)",
+                [(str(uuid), title, now) for uuid, title, is_liked in posts])
+            self._conn.executemany(
+                "INSERT INTO likes (account, uuid, liked, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (account, uuid) DO UPDATE SET liked = excluded.liked, updated_at = excluded.updated_at",
+                [(account, str(uuid), int(bool(is_liked)), now) for uuid, title, is_liked in posts])
+
+    def mark_liked(self, account, uuid, liked=True):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO likes (account, uuid, liked, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (account, uuid) DO UPDATE SET liked = excluded.liked, updated_at = excluded.updated_at",
+                (account, str(uuid), int(liked), time.time()))
+
+    def liked_uuids(self, account, uuids):
+        uuids = [str(uuid) for uuid in uuids]
+        if not uuids:
+            return set()
+        placeholders = ",".join("?" * len(uuids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT uuid FROM likes WHERE account = ? AND liked = 1 AND uuid IN ({placeholders})",
+                [account, *uuids]).fetchall()
+        return {row[0] for row in rows}
+
+    def get_cursor(self, account, feed):
+        with self._lock:
+            row = self._conn.execute("SELECT cursor FROM cursors WHERE account = ? AND feed = ?",
+                                     (account, feed)).fetchone()
+        return row[0] if row else None
+
+    def save_cursor(self, account, feed, cursor):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO cursors (account, feed, cursor, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (account, feed) DO UPDATE SET cursor = excluded.cursor, updated_at = excluded.updated_at",
+                (account, feed, cursor, time.time()))
+
+    def clear_cursor(self, account, feed):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cursors WHERE account = ? AND feed = ?", (account, feed))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_feed_index: FeedIndex | None = None
+_feed_index_lock = threading.Lock()
+
+
+# 进程内共享的索引实例
+def get_feed_index():
+    global _feed_index
+    if _feed_index is None:
+        with _feed_index_lock:
+            if _feed_index is None:
+                _feed_index = FeedIndex()
+    return _feed_index
@@ -0,0 +1,109 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+_LOGGER = logging.getLogger(__name__)
+
+# 后台任务线程数
+MAX_JOB_WORKERS = int(os.getenv("MAX_JOB_WORKERS", "2"))
+# 内存中最多保留的任务数，超出后淘汰最早的已结束任务
+MAX_KEEP_JOBS = int(os.getenv("MAX_KEEP_JOBS", "200"))
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCESS = "success"
+JOB_FAILED = "failed"
+
+
+class JobQueue:
+    def __init__(self, max_workers=MAX_JOB_WORKERS, max_keep=MAX_KEEP_JOBS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_keep = max_keep
+        # 去重键 -> 未结束的 job_id
+        self._active_keys: dict[str, str] = {}
+
+    # 提交任务，立即返回 job_id。func 返回结果字典，若包含 success=False 则任务记为失败
+    def submit(self, kind, func, *args, **kwargs):
+        return self._submit(None, kind, func, args, kwargs)[0]
+
+    # 按 key 去重提交：同一 key 已有未结束的任务时直接返回该任务，返回 (job_id, joined)
+    def submit_unique(self, key, kind, func, *args, **kwargs):
+        return self._submit(key, kind, func, args, kwargs)
+
+    def _submit(self, key, kind, func, args, kwargs):
+        with self._lock:
+            job_id = self._active_keys.get(key) if key is not None else None
+            if job_id is not None:
+                _LOGGER.info(f"任务进行中，复用: {kind} {job_id}")
+                return job_id, True
+            job_id = uuid.uuid4().hex
+            job = {
+                "id": job_id,
+                "kind": kind,
+                "key": key,
+                "status": JOB_PENDING,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "steps": [],
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job_id] = job
+            if key is not None:
+                self._active_keys[key] = job_id
+            self._evict()
+        self._executor.submit(self._run, job, func, args, kwargs)
+        _LOGGER.info(f"任务已提交: {kind} {job_id}")
+        return job_id, False
+
+    def _run(self, job, func, args, kwargs):
+        with self._lock:
+            job["status"] = JOB_RUNNING
+            job["started_at"] = time.time()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            _LOGGER.exception(f"任务执行异常: {job['kind']} {job['id']}")
+            status, result, error = JOB_FAILED, None, str(e)
+        else:
+            failed = isinstance(result, dict) and result.get("success") is False
+            status, error = (JOB_FAILED if failed else JOB_SUCCESS), None
+        with self._lock:
+            job["status"] = status
+            job["result"] = result
+            job["error"] = error
+            if isinstance(result, dict):
+                job["steps"] = result.get("steps", [])
+            job["finished_at"] = time.time()
+            if job["key"] is not None and self._active_keys.get(job["key"]) == job["id"]:
+                del self._active_keys[job["key"]]
+        _LOGGER.info(f"任务结束: {job['kind']} {job['id']} {status}")
+
+    def _evict(self):
+        if len(self._jobs) <= self._max_keep:
+            return
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self._max_keep:
+                break
+            if self._jobs[job_id]["status"] in (JOB_SUCCESS, JOB_FAILED):
+                del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+        end = snapshot["finished_at"] or time.time()
+        if snapshot["started_at"]:
+            snapshot["duration"] = round(end - snapshot["started_at"], 3)
+        else:
+            snapshot["duration"] = None
+        return snapshot
@@ -0,0 +1,83 @@
+import atexit
+import gzip
+import logging
+import os
+import queue
+import shutil
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.getenv("LOG_FILE", "app.log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))  # 10MB
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))  # 保留 5 个备份文件
+
+
+# 轮转出的旧日志压缩为 app.log.1.gz 等；压缩在 QueueListener 线程中进行，不占用请求线程
+def _gzip_namer(name):
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class CompressedRotatingFileHandler(RotatingFileHandler):
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.namer = _gzip_namer
+        self.rotator = _gzip_rotator
+
+
+# 进程内队列不需要序列化 record，跳过 QueueHandler.prepare 中的格式化：
+# 消息（包括 LazyPayload 的序列化）在 QueueListener 线程中才格式化，请求线程只负责入队
+class _InProcessQueueHandler(QueueHandler):
+    def prepare(self, record):
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+# 停止 listener 并写完队列中的日志；已停止的 listener（如调用方自行 stop 过）直接跳过
+def _stop_listener(listener):
+    if listener._thread is not None:
+        listener.stop()
+
+
+def _stop_current_listener():
+    if _listener is not None:
+        _stop_listener(_listener)
+
+
+# 日志异步输出：root logger 只挂 QueueHandler，控制台和（压缩轮转的）文件输出由后台 QueueListener 完成。
+# 返回已启动的 listener，进程退出时自动停止并写完队列中的日志。重复调用时先停止并替换之前的 listener
+def setup_logging(level=LOG_LEVEL, log_file=LOG_FILE, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+    global _listener
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(CompressedRotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                                      encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if _listener is not None:
+        _stop_listener(_listener)
+        for handler in _listener.handlers:
+            handler.close()
+    root.addHandler(_InProcessQueueHandler(log_queue))
+    root.setLevel(level)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    if _listener is None:
+        atexit.register(_stop_current_listener)
+    _listener = listener
+    return listener
@@ -0,0 +1,146 @@
+import threading
+from abc import ABC, abstractmethod
+
+# 轻量的 Prometheus 文本格式指标（不依赖 prometheus_client），通过 web_server 的 /metrics 暴露
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+# 取排序后第 round(q * (n - 1)) 个值，保留 3 位小数；values 为空时返回 None。run_history 和 benchmark 共用
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q * (len(values) - 1))))
+    return round(values[index], 3)
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 需要标签 {self.labelnames}，实际为 {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    # 返回该指标的样本行（不含 HELP/TYPE）
+    @abstractmethod
+    def _samples(self):
+        ...
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels):
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            for bound, count in zip(self.buckets, counts):
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render_metrics():
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+# ========== 上游请求 ==========
+UPSTREAM_REQUESTS = Counter("nikke_upstream_requests_total", "上游 HTTP 请求数", ("endpoint", "status"))
+UPSTREAM_LATENCY = Histogram("nikke_upstream_request_seconds", "上游 HTTP 请求耗时", ("endpoint",))
+UPSTREAM_API_ERRORS = Counter("nikke_upstream_api_errors_total", "上游返回非 0 code 的次数", ("endpoint", "code"))
+SLEEP_SECONDS = Counter("nikke_sleep_seconds_total", "主动等待的总时间（限速、重试退避）", ("kind",))
+
+# ========== 通知 ==========
+NOTIFY_REQUESTS = Counter("nikke_notify_requests_total", "推送请求数", ("status",))
+NOTIFY_LATENCY = Histogram("nikke_notify_request_seconds", "推送请求耗时")
+
+# ========== 签到流程 ==========
+SIGN_RUNS = Counter("nikke_sign_runs_total", "签到运行次数", ("status",))
+SIGN_RUN_SECONDS = Histogram("nikke_sign_run_seconds", "单个账号签到总耗时")
+SIGN_REUSED = Counter("nikke_sign_reused_total", "复用进行中或缓存的签到结果次数", ("kind",))
+SIGN_STEP_SECONDS = Histogram("nikke_sign_step_seconds", "签到各步骤耗时", ("step",))
+TOTAL_POINTS = Gauge("nikke_total_points", "账号当前总积分", ("account",))
+POINTS_GAINED = Counter("nikke_points_gained_total", "本进程运行期间获得的积分", ("account",))
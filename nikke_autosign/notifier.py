@@ -0,0 +1,227 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+from .cookie_store import atomic_write_json
+from .send import sc_send
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_LOGGER = logging.getLogger(__name__)
+
+# 待发送通知的持久化目录。每个进程写自己的 <owner>.json，并在进程存活期间锁住对应的 <owner>.lock；
+# 启动时接管已退出进程留下的队列文件，Web 服务和命令行同时运行时不会互相覆盖或重复发送
+NOTIFY_QUEUE_DIR = os.getenv("NOTIFY_QUEUE_DIR", "upload/notify_queue")
+# 收到通知后等待多久再发送，期间到达的通知合并为一条摘要
+NOTIFY_DIGEST_WINDOW = float(os.getenv("NOTIFY_DIGEST_WINDOW", "3"))
+# 发送失败后的重试次数和基础间隔（指数退避）
+NOTIFY_MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", "5"))
+NOTIFY_RETRY_DELAY = float(os.getenv("NOTIFY_RETRY_DELAY", "30"))
+
+
+def merge_notifications(items):
+    if len(items) == 1:
+        return items[0]["title"], items[0]["message"]
+    title = f"[Nikke自动签到]{len(items)} 条通知"
+    message = "\n\n---\n\n".join(f"### {item['title']}\n\n{item['message']}" for item in items)
+    return title, message
+
+
+# 非阻塞地对文件加排他锁，已被其他进程锁住时返回 False
+def _try_lock(f):
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+# 后台通知分发器：notify() 只入队并落盘后立即返回，由后台线程合并发送，失败按指数退避重试。
+# queue_dir 为空时不落盘
+class Notifier:
+    def __init__(self, queue_dir=NOTIFY_QUEUE_DIR, digest_window=NOTIFY_DIGEST_WINDOW,
+                 max_attempts=NOTIFY_MAX_ATTEMPTS, retry_delay=NOTIFY_RETRY_DELAY, send_func=sc_send):
+        self.queue_dir = queue_dir
+        self.digest_window = digest_window
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.send_func = send_func
+        self.queue_path = None
+        self._lock_file = None
+        self._pending = []
+        self._sending = False
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        if queue_dir:
+            try:
+                self._open_queue()
+            except OSError as e:
+                _LOGGER.error(f"初始化通知队列失败，通知只保存在内存中: {e}")
+
+    def _open_queue(self):
+        os.makedirs(self.queue_dir, exist_ok=True)
+        owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        lock_file = open(os.path.join(self.queue_dir, f"{owner}.lock"), "a+")
+        if not _try_lock(lock_file):
+            lock_file.close()
+            raise OSError(f"无法锁定通知队列 {owner}")
+        self._lock_file = lock_file
+        self.queue_path = os.path.join(self.queue_dir, f"{owner}.json")
+        for lock_path in glob.glob(os.path.join(self.queue_dir, "*.lock")):
+            if os.path.abspath(lock_path) != os.path.abspath(lock_file.name):
+                self._adopt(lock_path)
+        if self._pending:
+            _LOGGER.info(f"恢复 {len(self._pending)} 条未发送的通知")
+            with self._cond:
+                self._persist()
+
+    # 接管已退出进程留下的队列：能锁住它的 lock 文件说明原进程已不在运行
+    def _adopt(self, lock_path):
+        try:
+            f = open(lock_path, "a+")
+        except OSError:
+            return
+        with f:
+            if not _try_lock(f):
+                return
+            queue_path = lock_path[:-len(".lock")] + ".json"
+            if os.path.exists(queue_path):
+                try:
+                    with open(queue_path, "r", encoding="utf-8") as qf:
+                        self._pending.extend(json.load(qf))
+                except Exception as e:
+                    _LOGGER.error(f"读取通知队列 {queue_path} 失败: {e}")
+                # 先写入本进程的队列文件再删除旧文件，避免中途退出丢失通知
+                with self._cond:
+                    if not self._persist():
+                        return
+                os.remove(queue_path)
+            try:
+                os.remove(lock_path)
+            except OSError:
+                pass
+
+    # 调用方需持有 self._cond。落盘失败只记录日志，通知仍保留在内存中继续发送
+    def _persist(self):
+        if not self.queue_path:
+            return False
+        try:
+            atomic_write_json(self.queue_path, self._pending)
+            return True
+        except OSError as e:
+            _LOGGER.error(f"保存通知队列失败: {e}")
+            return False
+
+    def start(self):
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+                self._thread.start()
+        return self
+
+    def notify(self, title, message=""):
+        item = {
+            "id": uuid.uuid4().hex,
+            "title": title,
+            "message": message,
+            "created_at": time.time(),
+            "attempts": 0,
+            "next_try": 0.0,
+        }
+        with self._cond:
+            self._pending.append(item)
+            self._persist()
+            self._cond.notify_all()
+        self.start()
+        return item["id"]
+
+    def _ready_items(self, now):
+        return [item for item in self._pending if item["next_try"] <= now]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._ready_items(time.time()):
+                    if self._pending:
+                        timeout = min(item["next_try"] for item in self._pending) - time.time()
+                        self._cond.wait(max(timeout, 0.01))
+                    else:
+                        self._cond.wait()
+                self._sending = True
+            # 等待一小段时间，合并期间到达的通知
+            time.sleep(self.digest_window)
+            with self._cond:
+                batch = self._ready_items(time.time())
+            self._send_batch(batch)
+
+    def _send_batch(self, batch):
+        title, message = merge_notifications(batch)
+        error = None
+        try:
+            result = self.send_func(title=title, message=message)
+            if isinstance(result, dict) and result.get("code", 0) != 0:
+                error = f"推送服务返回错误: {result}"
+        except Exception as e:
+            error = str(e)
+        batch_ids = {item["id"] for item in batch}
+        with self._cond:
+            if error is None:
+                _LOGGER.info(f"通知发送成功，共合并 {len(batch)} 条")
+                self._pending = [item for item in self._pending if item["id"] not in batch_ids]
+            else:
+                now = time.time()
+                for item in self._pending:
+                    if item["id"] not in batch_ids:
+                        continue
+                    item["attempts"] += 1
+                    item["next_try"] = now + self.retry_delay * 2 ** (item["attempts"] - 1)
+                dropped = [item for item in self._pending
+                           if item["id"] in batch_ids and item["attempts"] >= self.max_attempts]
+                if dropped:
+                    _LOGGER.error(f"通知重试 {self.max_attempts} 次仍失败，放弃 {len(dropped)} 条: "
+                                  f"{[item['title'] for item in dropped]}")
+                    dropped_ids = {item["id"] for item in dropped}
+                    self._pending = [item for item in self._pending if item["id"] not in dropped_ids]
+                _LOGGER.error(f"发送通知失败，稍后重试: {error}")
+            self._persist()
+            self._sending = False
+            self._cond.notify_all()
+
+    # 等待当前可发送的通知全部处理完（命令行退出前调用），返回是否已清空
+    def flush(self, timeout=30):
+        deadline = time.time() + timeout
+        with self._cond:
+            while self._sending or self._ready_items(time.time()):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+
+_notifier: Notifier | None = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier():
+    global _notifier
+    if _notifier is None:
+        with _notifier_lock:
+            if _notifier is None:
+                _notifier = Notifier().start()
+    return _notifier
+
+
+def notify(title, message=""):
+    return get_notifier().notify(title, message)
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# 全进程共享的请求速率限制（每个 host 独立计算）
+PACING_RATE = float(os.getenv("PACING_RATE", "4"))  # 每秒请求数上限
+PACING_BURST = float(os.getenv("PACING_BURST", "2"))  # 允许的突发请求数
+PACING_JITTER = float(os.getenv("PACING_JITTER", "0.3"))  # 每次等待额外增加 0~jitter 秒的随机抖动
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    # 预约一个令牌，返回需要等待的秒数（不阻塞）。令牌可以透支，
+    # 并发调用者会依次排到后面的时间片，从而保证整体速率不超过 rate
+    def reserve(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    # 有可用令牌时立即取走并返回 True，否则返回 False（不预约）
+    def try_acquire(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class Pacer:
+    def __init__(self, rate=PACING_RATE, burst=PACING_BURST, jitter=PACING_JITTER):
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._total_wait = 0.0
+        self._total_requests = 0
+
+    def _bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    # 预约请求时间片，返回应等待的秒数（含抖动），调用方自行决定如何等待
+    def reserve(self, host):
+        delay = self._bucket(host).reserve()
+        if self.jitter > 0:
+            delay += random.uniform(0, self.jitter)
+        with self._lock:
+            self._total_wait += delay
+            self._total_requests += 1
+        return delay
+
+    def try_acquire(self, host):
+        acquired = self._bucket(host).try_acquire()
+        if acquired:
+            with self._lock:
+                self._total_requests += 1
+        return acquired
+
+    # 阻塞等待直到可以发出请求，返回实际等待秒数
+    def wait(self, host):
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def wait_async(self, host):
+        delay = self.reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self):
+        with self._lock:
+            return {"total_wait": round(self._total_wait, 3), "total_requests": self._total_requests}
+
+
+# 进程内所有 reader 共享的 pacer
+PACER = Pacer()
@@ -0,0 +1,131 @@
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .auto_refresh_cookies import (create_driver, format_cookies, load_accounts, login, save_cookies_meta,
+                                  save_local_cookies, upload_json)
+from .common import ACCOUNT_FILE_PATH
+
+_LOGGER = logging.getLogger(__name__)
+
+# 同时运行的浏览器实例数
+MAX_BROWSERS = int(os.getenv("MAX_BROWSERS", "3"))
+
+
+# 有界浏览器池：按需启动浏览器，用完归还给下一个账号复用，出错的浏览器直接关闭丢弃
+class BrowserPool:
+    def __init__(self, size=MAX_BROWSERS, headless=True):
+        self.size = max(1, size)
+        self.headless = headless
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(self.size)
+
+    @contextmanager
+    def acquire(self):
+        self._semaphore.acquire()
+        driver = None
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                _LOGGER.info("启动新的浏览器实例")
+                driver = create_driver(headless=self.headless)
+                with self._lock:
+                    self._created += 1
+            yield driver
+        except Exception:
+            if driver is not None:
+                self._quit(driver)
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                self._idle.put(driver)
+            self._semaphore.release()
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            _LOGGER.warning(f"关闭浏览器失败: {e}")
+
+    @property
+    def created(self):
+        return self._created
+
+    def close(self):
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+def _refresh_one(pool, account, email, password):
+    result = {"account": account, "success": False, "duration": None, "cookie_count": 0, "error": None}
+    start = time.perf_counter()
+    try:
+        with pool.acquire() as driver:
+            ret_cookies = login(email, password, human_typing=False, driver=driver)
+        formated_cookies = format_cookies(ret_cookies)
+        save_local_cookies(account, formated_cookies)
+        save_cookies_meta(account, ret_cookies)
+        result["success"] = True
+        result["cookie_count"] = len(formated_cookies)
+        result["cookies"] = formated_cookies
+    except Exception as e:
+        _LOGGER.error(f"[{account}] 刷新 Cookies 失败: {e}")
+        result["error"] = str(e)
+    result["duration"] = round(time.perf_counter() - start, 3)
+    _LOGGER.info(f"[{account}] 刷新{'成功' if result['success'] else '失败'}, 耗时 {result['duration']}s")
+    return result
+
+
+# 批量刷新多个账号，accounts 为 [(name, email, password)]，返回每个账号的耗时和结果
+def refresh_accounts(accounts, max_browsers=MAX_BROWSERS, headless=True):
+    pool = BrowserPool(size=max_browsers, headless=headless)
+    try:
+        with ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="refresh") as executor:
+            results = list(executor.map(lambda item: _refresh_one(pool, *item), accounts))
+    finally:
+        pool.close()
+    _LOGGER.info(f"批量刷新完成，共启动 {pool.created} 个浏览器")
+    return results
+
+
+# 将所有刷新成功的账号 cookies 一次性上传
+def upload_results(results):
+    batch = {result["account"]: result["cookies"] for result in results if result["success"]}
+    if not batch:
+        _LOGGER.warning("没有可上传的 Cookies")
+        return
+    upload_json(batch, path="/upload_cookies_batch")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler()])
+    parser = argparse.ArgumentParser(description="并发刷新多个账号的 Cookies 并批量上传")
+    parser.add_argument("accounts", nargs="*", help="要刷新的账号名，默认全部")
+    parser.add_argument("--browsers", type=int, default=MAX_BROWSERS, help="同时运行的浏览器数")
+    parser.add_argument("--headful", action="store_true", help="显示浏览器窗口")
+    parser.add_argument("--no-upload", action="store_true", help="只刷新不上传")
+    args = parser.parse_args()
+
+    all_accounts = load_accounts(ACCOUNT_FILE_PATH)
+    if args.accounts:
+        all_accounts = [item for item in all_accounts if item[0] in args.accounts]
+    refresh_results = refresh_accounts(all_accounts, max_browsers=args.browsers, headless=not args.headful)
+    print(json.dumps([{k: v for k, v in result.items() if k != "cookies"} for result in refresh_results],
+                     ensure_ascii=False, indent=2))
+    if not args.no_upload:
+        upload_results(refresh_results)
@@ -0,0 +1,139 @@
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+
+_LOGGER = logging.getLogger(__name__)
+
+# 熔断：同一 host 连续失败 CIRCUIT_FAILURE_THRESHOLD 次后熔断 CIRCUIT_RECOVERY_SECONDS 秒，期间请求直接失败
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RECOVERY_SECONDS = float(os.getenv("CIRCUIT_RECOVERY_SECONDS", "30"))
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+# 判断是否为上游暂时性故障（连接失败、超时、5xx、429），这类错误计入熔断并可重试
+def is_transient_error(e):
+    if isinstance(e, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return e.response.status_code >= 500 or e.response.status_code == 429
+    return False
+
+
+class RetryPolicy:
+    # max_attempts: 最大尝试次数（含首次）；接口返回非 0 code 属于业务拒绝（如游标失效、已签到），不重试；
+    # connect_only: 只重试请求确定未发出的错误（连接超时），用于非幂等接口
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=4.0, connect_only=False):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.connect_only = connect_only
+
+    def should_retry(self, e, attempt):
+        if attempt >= self.max_attempts:
+            return False
+        if self.connect_only:
+            return isinstance(e, requests.ConnectTimeout)
+        return is_transient_error(e)
+
+    # 指数退避 + 全抖动
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+# 幂等的查询接口：重试网络/5xx 等暂时性故障
+IDEMPOTENT_POLICY = RetryPolicy(max_attempts=3)
+# 签到：重复提交无害，同样只重试暂时性故障
+TRANSIENT_ONLY_POLICY = RetryPolicy(max_attempts=3)
+# 点赞：再次提交会取消点赞，只在请求确定未发出时重试
+NON_IDEMPOTENT_POLICY = RetryPolicy(max_attempts=2, connect_only=True)
+
+# 按接口名配置重试策略，未配置的接口使用 TRANSIENT_ONLY_POLICY
+RETRY_POLICIES = {
+    "GetPostList": IDEMPOTENT_POLICY,
+    "GetPost": IDEMPOTENT_POLICY,
+    "GetTaskListWithStatusV2": IDEMPOTENT_POLICY,
+    "GetUserTotalPoints": IDEMPOTENT_POLICY,
+    "DailyCheckIn": TRANSIENT_ONLY_POLICY,
+    "PostStar": NON_IDEMPOTENT_POLICY,
+}
+
+
+def get_retry_policy(url):
+    endpoint = url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+    return RETRY_POLICIES.get(endpoint, TRANSIENT_ONLY_POLICY)
+
+
+# 熔断器，所有账号共享。closed -> 连续失败达到阈值 -> open -> 冷却结束后放行一个试探请求（half_open）
+# -> 成功则 closed，失败则重新 open
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, recovery_seconds=CIRCUIT_RECOVERY_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.recovery_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(f"{self.name} 上游异常，已熔断，请稍后重试")
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                _LOGGER.info(f"{self.name} 熔断恢复")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    _LOGGER.warning(f"{self.name} 连续失败 {self._failures} 次，熔断 {self.recovery_seconds} 秒")
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    # 请求未能得出结论（如非暂时性错误）时释放试探名额
+    def release(self):
+        with self._lock:
+            self._trial_in_flight = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host):
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
@@ -0,0 +1,215 @@
+import atexit
+import json
+import logging
+import os
+import pathlib
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from .metrics import percentile
+
+_LOGGER = logging.getLogger(__name__)
+
+# 签到运行历史数据库：每次实际执行的 run_sign 记录一行（复用的结果不记录）
+RUN_HISTORY_PATH = os.getenv("RUN_HISTORY_PATH", "upload/run_history.db")
+# 后台写入线程每批最多写入的记录数、最长攒批时间（秒）
+RUN_HISTORY_BATCH_SIZE = int(os.getenv("RUN_HISTORY_BATCH_SIZE", "50"))
+RUN_HISTORY_FLUSH_SECONDS = float(os.getenv("RUN_HISTORY_FLUSH_SECONDS", "2"))
+# 历史记录保留天数，启动时清理更早的记录；0 表示不清理
+RUN_HISTORY_KEEP_DAYS = float(os.getenv("RUN_HISTORY_KEEP_DAYS", "90"))
+# 积分趋势最多返回的点数
+POINTS_TREND_LIMIT = 30
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    success INTEGER NOT NULL,
+    partial INTEGER NOT NULL,
+    total_points INTEGER,
+    errors TEXT NOT NULL,
+    messages TEXT NOT NULL,
+    steps TEXT NOT NULL,
+    plan TEXT,
+    upstream_errors TEXT NOT NULL,
+    trace_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_account_started ON runs (account, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at);
+'''
+
+_COLUMNS = ("account", "started_at", "duration", "success", "partial", "total_points", "errors", "messages", "steps",
+            "plan", "upstream_errors", "trace_id")
+_JSON_COLUMNS = ("errors", "messages", "steps", "plan", "upstream_errors")
+
+
+def _where(account, since):
+    conditions, params = [], []
+    if account:
+        conditions.append("account = ?")
+        params.append(account)
+    if since is not None:
+        conditions.append("started_at >= ?")
+        params.append(since)
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+
+def _to_row(account, started_at, duration, result):
+    return (
+        account,
+        started_at,
+        round(duration, 3),
+        int(bool(result.get("success"))),
+        int(bool(result.get("partial"))),
+        result.get("total_points") if isinstance(result.get("total_points"), int) else None,
+        json.dumps(result.get("errors", []), ensure_ascii=False),
+        json.dumps(result.get("messages", []), ensure_ascii=False),
+        json.dumps(result.get("steps", []), ensure_ascii=False),
+        json.dumps(result.get("plan"), ensure_ascii=False),
+        json.dumps(result.get("upstream_errors", {}), ensure_ascii=False),
+        result.get("trace_id"),
+    )
+
+
+def _from_row(row):
+    run = dict(zip(("id",) + _COLUMNS, row))
+    for column in _JSON_COLUMNS:
+        run[column] = json.loads(run[column]) if run[column] else None
+    run["success"] = bool(run["success"])
+    run["partial"] = bool(run["partial"])
+    return run
+
+
+# 运行历史存储。record() 只入队立即返回，由后台线程攒批后一次性写入，不阻塞签到流程。
+# read_only=True 时以只读方式打开已有的数据库（不建表、不清理、不启动写入线程），供 nikke status 等查询使用
+class RunHistory:
+    def __init__(self, path=RUN_HISTORY_PATH, batch_size=RUN_HISTORY_BATCH_SIZE,
+                 flush_seconds=RUN_HISTORY_FLUSH_SECONDS, keep_days=RUN_HISTORY_KEEP_DAYS, read_only=False):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        if read_only:
+            self._conn = sqlite3.connect(f"{pathlib.Path(path).absolute().as_uri()}?mode=ro", uri=True,
+                                         check_same_thread=False)
+            return
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            if keep_days:
+                self._conn.execute("DELETE FROM runs WHERE started_at < ?", (time.time() - keep_days * 86400,))
+        self._thread = threading.Thread(target=self._writer, name="run-history", daemon=True)
+        self._thread.start()
+
+    def record(self, account, started_at, duration, result):
+        if self.read_only:
+            raise ValueError("只读的运行历史不能写入")
+        self._queue.put(_to_row(account, started_at, duration, result))
+
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    f"INSERT INTO runs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})", batch)
+        except sqlite3.Error as e:
+            _LOGGER.error(f"写入运行历史失败，丢弃 {len(batch)} 条记录: {e}")
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    # 等待已入队的记录全部写入
+    def flush(self):
+        self._queue.join()
+
+    def list_runs(self, account=None, since=None, limit=50):
+        where, params = _where(account, since)
+        sql = f"SELECT id, {', '.join(_COLUMNS)} FROM runs{where} ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_from_row(row) for row in rows]
+
+    # 按账号聚合：成功率、耗时 p50/p95、积分趋势（时间升序）和上游错误分布
+    def stats(self, account=None, since=None):
+        where, params = _where(account, since)
+        sql = ("SELECT account, started_at, duration, success, partial, total_points, upstream_errors "
+               f"FROM runs{where} ORDER BY started_at")
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        grouped = {}
+        for row_account, started_at, duration, success, partial, total_points, upstream_errors in rows:
+            item = grouped.setdefault(row_account, {"durations": [], "success": 0, "partial": 0, "points": [],
+                                                    "errors": Counter(), "last_run_at": None})
+            item["durations"].append(duration)
+            item["success"] += success
+            item["partial"] += partial
+            if total_points is not None:
+                item["points"].append({"at": started_at, "total_points": total_points})
+            item["errors"].update(json.loads(upstream_errors or "{}"))
+            item["last_run_at"] = started_at
+
+        stats = {}
+        for row_account, item in grouped.items():
+            runs = len(item["durations"])
+            stats[row_account] = {
+                "runs": runs,
+                "success_rate": round(item["success"] / runs, 4),
+                "partial_runs": item["partial"],
+                "duration_p50": percentile(item["durations"], 0.5),
+                "duration_p95": percentile(item["durations"], 0.95),
+                "points_trend": item["points"][-POINTS_TREND_LIMIT:],
+                "upstream_errors": dict(item["errors"].most_common()),
+                "last_run_at": item["last_run_at"],
+            }
+        return stats
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+_run_history: RunHistory | None = None
+_run_history_lock = threading.Lock()
+
+
+# 进程内共享的运行历史实例，进程退出前写完队列中的记录
+def get_run_history():
+    global _run_history
+    if _run_history is None:
+        with _run_history_lock:
+            if _run_history is None:
+                _run_history = RunHistory()
+                atexit.register(_run_history.flush)
+    return _run_history
+
+
+# 只读打开运行历史，数据库文件不存在（尚未有运行记录）时返回 None，不会创建文件
+def open_run_history_readonly(path=RUN_HISTORY_PATH):
+    if not os.path.exists(path):
+        return None
+    return RunHistory(path, read_only=True)
@@ -0,0 +1,70 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from .common import SEND_KEY_FILE_PATH
+from .metrics import NOTIFY_LATENCY, NOTIFY_REQUESTS
+from .transport import get_session
+
+_LOGGER = logging.getLogger(__name__)
+
+# 推送请求超时（秒）
+SEND_TIMEOUT = float(os.getenv("SEND_TIMEOUT", "10"))
+
+_send_key_cache = {"mtime": None, "send_key": None}
+_send_key_lock = threading.Lock()
+
+
+# 缓存 send_key，文件修改时间变化时才重新读取
+def load_send_key():
+    mtime = os.path.getmtime(SEND_KEY_FILE_PATH)
+    with _send_key_lock:
+        if _send_key_cache["mtime"] != mtime:
+            with open(SEND_KEY_FILE_PATH, "r") as f:
+                json_dic = json.load(f)
+            _send_key_cache["send_key"] = json_dic["SEND_KEY"]
+            _send_key_cache["mtime"] = mtime
+        return _send_key_cache["send_key"]
+
+
+def sc_send(title, message='', options=None, timeout=SEND_TIMEOUT):
+    send_key = load_send_key()
+
+    if options is None:
+        options = {}
+    # 判断 sendkey 是否以 'sctp' 开头，并提取数字构造 URL
+    if send_key.startswith('sctp'):
+        match = re.match(r'sctp(\d+)t', send_key)
+        if match:
+            num = match.group(1)
+            url = f'https://{num}.push.ft07.com/send/{send_key}.send'
+        else:
+            raise ValueError('Invalid sendkey format for sctp')
+    else:
+        url = f'https://sctapi.ftqq.com/{send_key}.send'
+    params = {
+        'title': title,
+        'desp': message,
+        **options
+    }
+    headers = {
+        'Content-Type': 'application/json;charset=utf-8'
+    }
+    start = time.perf_counter()
+    try:
+        response = get_session().post(url, json=params, headers=headers, timeout=timeout)
+        result = response.json()
+    except Exception:
+        NOTIFY_REQUESTS.inc(status="error")
+        raise
+    finally:
+        NOTIFY_LATENCY.observe(time.perf_counter() - start)
+    NOTIFY_REQUESTS.inc(status=response.status_code)
+    return result
+
+
+if __name__ == '__main__':
+    sc_send('测试标题', '测试内容')
@@ -0,0 +1,105 @@
+import logging
+import random
+import re
+
+from .blablalink_reader import BlablaLinkReader
+
+_LOGGER = logging.getLogger(__name__)
+
+# 每日签到任务 id，与 BlablaLinkReader.check_in 提交的 task_id 一致
+CHECK_IN_TASK_ID = "15"
+
+# 已知 id 的任务直接按 id 识别，其余任务按名称识别
+_TASK_KIND_BY_ID = {CHECK_IN_TASK_ID: "check_in"}
+
+# 通过任务名称识别任务类型（任务名随语言变化，这里覆盖繁简中文和英文）。整名匹配"动作 + 数量 + 帖子"的形式，
+# 避免"獲得點讚""review"之类的任务因包含关键字被误判为可以通过 阅读→点赞 完成
+_POST_SUFFIX_ZH = r"(任意)?\s*\d*\s*[篇則条條个個]?(貼文|帖子|文章|動態|动态)?"
+_POST_SUFFIX_EN = r"(\s+\d+)?(\s+posts?)?"
+_TASK_NAME_PATTERNS = (
+    ("check_in", re.compile(r"^(每日)?(簽到|签到)$|^(daily\s+)?(check[- ]?in|sign[- ]?in)$")),
+    ("like", re.compile(rf"^(每日)?(點讚|点赞|按讚){_POST_SUFFIX_ZH}$|^(daily\s+)?like{_POST_SUFFIX_EN}$")),
+    ("read", re.compile(rf"^(每日)?(閱讀|阅读|瀏覽|浏览){_POST_SUFFIX_ZH}$"
+                        rf"|^(daily\s+)?(read|browse|view){_POST_SUFFIX_EN}$")),
+)
+_COUNT_RE = re.compile(r"(\d+)")
+
+
+def default_post_num():
+    return random.randint(6, 8)
+
+
+def _task_kind(task_data):
+    kind = _TASK_KIND_BY_ID.get(str(task_data.get("task_id", "")))
+    if kind:
+        return kind
+    name = str(task_data.get("task_name", "")).strip().lower()
+    for kind, pattern in _TASK_NAME_PATTERNS:
+        if pattern.match(name):
+            return kind
+    return None
+
+
+# 任务名中带数量（如 "點讚3篇貼文"）时按该数量执行，否则使用默认数量
+def _task_count(task_data, default):
+    match = _COUNT_RE.search(str(task_data.get("task_name", "")))
+    if match and 0 < int(match.group(1)) <= 20:
+        return int(match.group(1))
+    return default
+
+
+# 完整计划：与原流程一致，签到 + 随机 6~8 篇帖子的 阅读→点赞
+def full_plan():
+    return {"check_in": True, "posts": default_post_num(), "pending_tasks": [], "skipped_tasks": []}
+
+
+def is_plan_empty(plan):
+    return not plan["check_in"] and plan["posts"] <= 0
+
+
+# 最终检查任务状态时是否要求该任务已完成：计划中跳过的任务（无法通过签到/阅读/点赞完成）不要求
+def is_required_task(plan, task_data):
+    return task_data.get("task_name") not in plan.get("skipped_tasks", [])
+
+
+# 根据任务状态生成只包含未完成工作的计划。阅读和点赞在同一帖子上以 阅读→点赞 链路完成，
+# 所需帖子数取二者较大值。无法识别的未完成任务不能靠 阅读→点赞 完成，只记录不执行；
+# 但任务列表中一个阅读/点赞任务都识别不出来时（如任务名改版），退回完整的帖子数量。
+# 跳过的任务记录在 skipped_tasks 中，最终检查时不要求完成（见 is_required_task）
+def build_plan(tasks):
+    plan = {"check_in": False, "posts": 0, "pending_tasks": [], "skipped_tasks": []}
+    unknown_tasks = []
+    has_post_tasks = False
+    for task_data in tasks:
+        kind = _task_kind(task_data)
+        has_post_tasks = has_post_tasks or kind in ("read", "like")
+        if BlablaLinkReader.is_task_completed(task_data):
+            continue
+        if kind == "check_in":
+            plan["check_in"] = True
+        elif kind in ("read", "like"):
+            plan["posts"] = max(plan["posts"], _task_count(task_data, default_post_num()))
+        else:
+            unknown_tasks.append(task_data.get("task_name"))
+            continue
+        plan["pending_tasks"].append(task_data.get("task_name"))
+    if unknown_tasks and has_post_tasks:
+        _LOGGER.info(f"以下未完成任务无法通过阅读/点赞完成，跳过: {unknown_tasks}")
+        plan["skipped_tasks"] = unknown_tasks
+    elif unknown_tasks:
+        plan["pending_tasks"].extend(unknown_tasks)
+        _LOGGER.warning(f"无法识别的未完成任务，按完整流程执行: {unknown_tasks}")
+        plan["posts"] = max(plan["posts"], default_post_num())
+    return plan
+
+
+# 查询任务状态并生成计划，查询失败时退回完整计划
+def make_plan(reader: BlablaLinkReader):
+    try:
+        tasks = reader.get_task_list()
+    except Exception as e:
+        _LOGGER.warning(f"获取任务状态失败，按完整流程执行: {e}")
+        return full_plan()
+    plan = build_plan(tasks)
+    _LOGGER.info(f"签到计划: {plan}")
+    return plan
@@ -0,0 +1,323 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .async_reader import AsyncBlablaLinkReader
+from .blablalink_reader import BlablaLinkReader
+from .common import DEFAULT_ACCOUNT, list_accounts, load_account_cookies
+from .deadline import SIGN_BUDGET, Deadline, DeadlineExceeded
+from .feed_index import get_feed_index
+from .metrics import POINTS_GAINED, SIGN_REUSED, SIGN_RUN_SECONDS, SIGN_RUNS, SIGN_STEP_SECONDS, TOTAL_POINTS
+from .notifier import get_notifier, notify
+from .run_history import get_run_history
+from .sign_planner import is_plan_empty, is_required_task, make_plan
+from .single_flight import SingleFlight
+from .tracing import current_tracer, span, trace_run
+
+_LOGGER = logging.getLogger(__name__)
+
+# 多账号并发签到的最大线程数
+MAX_SIGN_WORKERS = int(os.getenv("MAX_SIGN_WORKERS", "4"))
+# 同一账号成功签到后，在该时间（秒）内再次请求直接返回上次结果，不访问上游；0 表示不缓存
+SIGN_RESULT_CACHE_SECONDS = float(os.getenv("SIGN_RESULT_CACHE_SECONDS", "300"))
+
+
+def _new_result(account, errors=None):
+    return {
+        "account": account,
+        "success": False,
+        "errors": errors or [],
+        "messages": [],
+        "total_points": None,
+        "plan": None,
+        "partial": False,
+        "steps": [],
+        "trace_id": None,
+        "reused": None,
+        "upstream_errors": {},
+    }
+
+
+# 按账号合并签到：同一账号同时只有一个签到在执行，只缓存成功的结果，失败后可立即重试
+_sign_flight = SingleFlight(cache_seconds=SIGN_RESULT_CACHE_SECONDS, should_cache=lambda result: result["success"])
+
+
+# 记录步骤耗时（秒），写入 result["steps"]；开启追踪时同时记录为 span
+@contextmanager
+def timed_step(result, name):
+    start = time.perf_counter()
+    try:
+        with span(name):
+            yield
+    finally:
+        duration = time.perf_counter() - start
+        result["steps"].append({"name": name, "duration": round(duration, 3)})
+        SIGN_STEP_SECONDS.observe(duration, step=name)
+
+
+# 时间预算用完时标记为部分结果，调用方据此跳过后续步骤
+def _out_of_time(result, deadline, err_list, step):
+    if not deadline.expired():
+        return False
+    _LOGGER.warning(f"[{result['account']}] 时间预算已用完，跳过 {step} 及后续步骤")
+    err_list.append(f"时间预算 {deadline.budget} 秒已用完，未执行: {step} 及后续步骤")
+    result["partial"] = True
+    return True
+
+
+# 记录一次签到的结果指标；积分增量按本进程内上次看到的总积分计算
+def _record_run_metrics(result, duration):
+    if result["partial"]:
+        status = "partial"
+    else:
+        status = "success" if result["success"] else "failed"
+    SIGN_RUNS.inc(status=status)
+    SIGN_RUN_SECONDS.observe(duration)
+    total_points = result["total_points"]
+    if isinstance(total_points, (int, float)):
+        account = result["account"]
+        last_points = TOTAL_POINTS.get(account=account)
+        if last_points is not None and total_points > last_points:
+            POINTS_GAINED.inc(total_points - last_points, account=account)
+        TOTAL_POINTS.set(total_points, account=account)
+
+
+# 执行单个账号的签到流程，返回该账号的结果字典（不发送通知）。
+# budget 为本次签到的总时间预算（秒），用完后提前结束并返回部分结果；
+# trace/profile 开启时记录本次运行的时间线（及 cProfile），trace 文件 id 写入 result["trace_id"]
+# 每次实际执行都记录指标并写入运行历史
+def run_sign(cookies, account=DEFAULT_ACCOUNT, budget=SIGN_BUDGET, trace=False, profile=False):
+    result = None
+    reader = None
+    started_at = time.time()
+    start = time.perf_counter()
+    with trace_run(f"sign {account}", enabled=trace, profile=profile):
+        try:
+            deadline = Deadline(budget)
+            reader = BlablaLinkReader(cookies=cookies, account=account, feed_index=get_feed_index(),
+                                      deadline=deadline)
+            reader.init_session()
+            result = _run_sign(reader, deadline)
+            tracer = current_tracer()
+            if tracer is not None:
+                result["trace_id"] = tracer.run_id
+            return result
+        except Exception as e:
+            result = _new_result(account, errors=[f"签到异常: {str(e)}"])
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            if reader is not None:
+                result["upstream_errors"] = dict(reader.upstream_errors)
+            _record_run_metrics(result, duration)
+            get_run_history().record(account, started_at, duration, result)
+
+
+# run_sign 的去重版本：同一账号已有签到在执行时等待并返回其结果，缓存期内直接返回上次成功的结果，
+# 复用的结果 result["reused"] 为 "joined" 或 "cached"。force=True 时忽略缓存（仍会加入进行中的签到）
+def run_sign_once(cookies, account=DEFAULT_ACCOUNT, budget=SIGN_BUDGET, trace=False, profile=False, force=False):
+    if force:
+        _sign_flight.forget(account)
+    result, reused = _sign_flight.do(account, run_sign, cookies, account=account, budget=budget,
+                                     trace=trace, profile=profile)
+    if reused:
+        _LOGGER.info(f"[{account}] 复用{'进行中' if reused == 'joined' else '缓存'}的签到结果")
+        SIGN_REUSED.inc(kind=reused)
+        result["reused"] = reused
+    return result
+
+
+def _run_sign(reader, deadline):
+    account = reader.account
+    result = _new_result(account)
+
+    # 先查询任务状态，只执行未完成的部分
+    with timed_step(result, "plan"):
+        plan = make_plan(reader)
+    result["plan"] = plan
+    if is_plan_empty(plan):
+        _LOGGER.info(f"[{account}] 今日积分任务已全部完成，无需执行")
+        result["messages"].append("今日积分任务已全部完成，无需执行")
+        result["success"] = True
+        return result
+
+    # 签到
+    err_list = []
+    if plan["check_in"] and not _out_of_time(result, deadline, err_list, "check_in"):
+        _LOGGER.info(f"[{account}] 开始签到")
+        with timed_step(result, "check_in"):
+            try:
+                reader.check_in()
+                _LOGGER.info(f"[{account}] 签到成功")
+            except Exception as e:
+                err_list.append(f"每日签到任务失败: {str(e)}")
+
+    # 边翻页边阅读并点赞，够数后停止翻页
+    if plan["posts"] > 0 and not result["partial"] and not _out_of_time(result, deadline, err_list, "read_like"):
+        _LOGGER.info(f"[{account}] 开始阅读并点赞")
+        with timed_step(result, "read_like"):
+            want_like_num = plan["posts"]
+            async_reader = AsyncBlablaLinkReader(reader=reader)
+            outcomes, list_error = asyncio.run(
+                async_reader.read_and_like_stream(reader.iter_posts(filter_is_liked=False), want_like_num))
+            for post, e in outcomes:
+                if e is not None and not isinstance(e, DeadlineExceeded):
+                    err_list.append(f"阅读/点赞帖子失败: {str(e)}")
+            success_num = sum(1 for post, e in outcomes if e is None)
+            if isinstance(list_error, DeadlineExceeded):
+                err_list.append(f"阅读/点赞未完成: {str(list_error)}")
+                result["partial"] = True
+            elif list_error is not None:
+                err_list.append(f"获取帖子失败: {str(list_error)}")
+            elif success_num < want_like_num:
+                err_list.append(f"获取帖子失败, 结果数量不足, want={want_like_num}, get={success_num}")
+
+    message_list = []
+    if result["partial"] or _out_of_time(result, deadline, err_list, "check_task"):
+        result["errors"] = err_list
+        return result
+
+    _LOGGER.info(f"[{account}] 任务完成，开始检查积分任务状态")
+    with timed_step(result, "check_task"):
+        try:
+            reader.check_task_finished(is_required=lambda task_data: is_required_task(plan, task_data))
+            _LOGGER.info(f"[{account}] 积分任务状态已完成")
+            if err_list:
+                _LOGGER.info(f"[{account}] 积分任务已完成，清空错误列表: {err_list}")
+                message_list.append(f"积分任务已完成，错误列表: {err_list}")
+                err_list = []
+        except DeadlineExceeded as e:
+            # 与其他步骤一致：预算用完时标记为部分结果
+            _LOGGER.warning(f"[{account}] 时间预算已用完，未能检查积分任务状态")
+            err_list.append(f"检查积分任务状态未完成: {str(e)}")
+            result["partial"] = True
+        except Exception as e:
+            err_list.append(f"检查积分任务状态失败: {str(e)}")
+
+    result["errors"] = err_list
+    result["messages"] = message_list
+    if err_list:
+        return result
+
+    result["success"] = True
+    # 展示当前总积分（任务已完成，预算不足时只跳过积分查询）
+    if deadline.expired():
+        message_list.append("时间预算已用完，跳过总积分获取")
+        result["partial"] = True
+        return result
+    _LOGGER.info(f"[{account}] 总积分获取")
+    with timed_step(result, "total_points"):
+        try:
+            total_reward = reader.get_total_reward()
+            result["total_points"] = total_reward
+            message_list.append(f"总积分: {total_reward}")
+        except Exception as e:
+            _LOGGER.error(f"[{account}] 总积分获取失败: {str(e)}")
+            message_list.append(f"总积分获取失败: {str(e)}")
+    return result
+
+
+def sign_account(account, budget=SIGN_BUDGET):
+    try:
+        cookies = load_account_cookies(account)
+    except Exception as e:
+        _LOGGER.error(f"[{account}] 读取 cookies 失败: {str(e)}")
+        return _new_result(account, errors=[f"读取 cookies 失败: {str(e)}"])
+    try:
+        return run_sign_once(cookies, account=account, budget=budget)
+    except Exception as e:
+        _LOGGER.exception(f"[{account}] 签到异常")
+        return _new_result(account, errors=[f"签到异常: {str(e)}"])
+
+
+# 并发签到多个账号，总耗时约等于最慢的那个账号，结果按账号顺序返回
+def sign_accounts(accounts=None, max_workers=None, budget=SIGN_BUDGET):
+    if accounts is None:
+        accounts = list_accounts()
+    if not accounts:
+        return []
+    max_workers = max(1, min(max_workers or MAX_SIGN_WORKERS, len(accounts)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sign") as executor:
+        return list(executor.map(lambda account: sign_account(account, budget=budget), accounts))
+
+
+def format_summary(results):
+    success_num = sum(1 for result in results if result["success"])
+    lines = [f"成功 {success_num}/{len(results)} 个账号"]
+    for result in results:
+        status = "成功" if result["success"] else "失败"
+        detail = result["messages"] + result["errors"]
+        lines.append(f"[{result['account']}] {status}: " + "；".join(str(item) for item in detail))
+    return "\n\n".join(lines)
+
+
+# 单账号签到结果通知，与原 /sign 的通知内容保持一致；通知由后台分发器异步发送
+# 通知失败只记录日志，不影响签到结果
+def notify_result(result):
+    if result["errors"]:
+        err_msg = "\n\n".join(result["errors"])
+        title, message = "[Nikke自动签到]签到失败！", f"签到失败:\n\n {err_msg}"
+    else:
+        title, message = "[Nikke自动签到]成功！", "签到成功！\n\n" + "\n\n".join(result["messages"])
+    try:
+        notify(title=title, message=message)
+    except Exception as e:
+        _LOGGER.error(f"[{result.get('account')}] 发送通知失败: {e}")
+
+
+# 签到并发送通知，供后台任务使用；开启追踪时通知步骤也记录在同一个 trace 中。
+# 复用其他调用的结果时不再重复通知
+def sign_and_notify(cookies, account=DEFAULT_ACCOUNT, budget=SIGN_BUDGET, trace=False, profile=False, force=False):
+    with trace_run(f"sign {account}", enabled=trace, profile=profile):
+        result = run_sign_once(cookies, account=account, budget=budget, force=force)
+        if not result["reused"]:
+            with timed_step(result, "notify"):
+                notify_result(result)
+    return result
+
+
+def notify_summary(results):
+    if not results:
+        return
+    if all(result["success"] for result in results):
+        title = "[Nikke自动签到]成功！"
+    else:
+        title = "[Nikke自动签到]部分账号签到失败！"
+    try:
+        notify(title=title, message=format_summary(results))
+    except Exception as e:
+        _LOGGER.error(f"发送汇总通知失败: {e}")
+
+
+# 多账号签到并发送汇总通知，供后台任务使用
+def sign_accounts_and_notify(accounts=None, max_workers=None, budget=SIGN_BUDGET):
+    batch = {"success": False, "accounts": [], "steps": []}
+    with timed_step(batch, "sign_accounts"):
+        results = sign_accounts(accounts, max_workers=max_workers, budget=budget)
+    with timed_step(batch, "notify"):
+        notify_summary(results)
+    batch["accounts"] = results
+    batch["success"] = all(result["success"] for result in results)
+    return batch
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler()])
+    parser = argparse.ArgumentParser(description="多账号并发签到")
+    parser.add_argument("accounts", nargs="*", help="要签到的账号，默认全部")
+    parser.add_argument("--workers", type=int, default=None, help="并发线程数")
+    parser.add_argument("--budget", type=float, default=SIGN_BUDGET, help="每个账号的签到时间预算（秒）")
+    parser.add_argument("--no-notify", action="store_true", help="不发送通知")
+    args = parser.parse_args()
+
+    sign_results = sign_accounts(args.accounts or None, max_workers=args.workers, budget=args.budget)
+    print(json.dumps(sign_results, ensure_ascii=False, indent=2))
+    if not args.no_notify:
+        notify_summary(sign_results)
+        get_notifier().flush()
@@ -0,0 +1,216 @@
+import argparse
+import datetime
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import list_accounts
+from .cookie_store import atomic_write_json
+from .notifier import get_notifier
+from .sign_runner import notify_result, sign_account
+
+_LOGGER = logging.getLogger(__name__)
+
+# 内置签到调度：每天从 SIGN_SCHEDULE_START（本地时间 HH:MM）开始，把各账号的签到均匀分散到
+# SIGN_SCHEDULE_WINDOW_SECONDS 秒的窗口内，并叠加随机抖动；同时签到的账号数不超过 SIGN_SCHEDULE_CONCURRENCY
+SIGN_SCHEDULE_START = os.getenv("SIGN_SCHEDULE_START", "08:00")
+SIGN_SCHEDULE_WINDOW_SECONDS = float(os.getenv("SIGN_SCHEDULE_WINDOW_SECONDS", "3600"))
+SIGN_SCHEDULE_JITTER_SECONDS = float(os.getenv("SIGN_SCHEDULE_JITTER_SECONDS", "300"))
+SIGN_SCHEDULE_CONCURRENCY = int(os.getenv("SIGN_SCHEDULE_CONCURRENCY", "2"))
+# 签到失败后当天的重试间隔
+SIGN_SCHEDULE_RETRY_SECONDS = float(os.getenv("SIGN_SCHEDULE_RETRY_SECONDS", "1800"))
+# 调度线程的检查间隔
+SIGN_SCHEDULE_TICK_SECONDS = float(os.getenv("SIGN_SCHEDULE_TICK_SECONDS", "30"))
+# 各账号最近一次成功签到的记录，重启后当天已成功的账号不再签到
+SIGN_STATE_PATH = os.getenv("SIGN_STATE_PATH", "upload/sign_state.json")
+# web_server 启动时是否同时启动调度器
+SIGN_SCHEDULER_ENABLED = os.getenv("SIGN_SCHEDULER_ENABLED", "0") == "1"
+
+
+def _parse_start(start):
+    hour, minute = start.split(":", 1)
+    return datetime.time(int(hour), int(minute))
+
+
+class SignScheduler:
+    def __init__(self, start=SIGN_SCHEDULE_START, window=SIGN_SCHEDULE_WINDOW_SECONDS,
+                 jitter=SIGN_SCHEDULE_JITTER_SECONDS, concurrency=SIGN_SCHEDULE_CONCURRENCY,
+                 retry_seconds=SIGN_SCHEDULE_RETRY_SECONDS, tick_seconds=SIGN_SCHEDULE_TICK_SECONDS,
+                 state_path=SIGN_STATE_PATH, sign_func=sign_account):
+        self.start_time = _parse_start(start)
+        self.window = max(0.0, window)
+        self.jitter = max(0.0, jitter)
+        self.concurrency = max(1, concurrency)
+        self.retry_seconds = retry_seconds
+        self.tick_seconds = tick_seconds
+        self.state_path = state_path
+        self.sign_func = sign_func
+        self._state = self._load_state()
+        # 当天的计划：账号 -> 计划签到时间（unix 秒）
+        self._day = None
+        self._due: dict[str, float] = {}
+        self._running: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="sched-sign")
+        self._thread: threading.Thread | None = None
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            _LOGGER.error(f"读取签到状态失败: {e}")
+            return {}
+
+    # 调用方需持有 self._lock
+    def _save_state(self):
+        try:
+            atomic_write_json(self.state_path, self._state, indent=2)
+        except OSError as e:
+            _LOGGER.error(f"保存签到状态失败: {e}")
+
+    def _signed_today(self, account, day):
+        return self._state.get(account, {}).get("last_success_date") == day.isoformat()
+
+    def _window_start(self, day):
+        return datetime.datetime.combine(day, self.start_time).timestamp()
+
+    def _random_offset(self, slot, slots):
+        base = self.window * slot / slots if slots else 0.0
+        offset = base + random.uniform(-self.jitter, self.jitter)
+        return min(max(offset, 0.0), self.window)
+
+    # 为当天尚未成功的账号分配签到时间：按账号顺序均分窗口再叠加抖动，新出现的账号随机分配
+    def _plan(self, day, accounts):
+        if day != self._day:
+            self._day = day
+            self._due = {}
+            pending = [account for account in accounts if not self._signed_today(account, day)]
+            for slot, account in enumerate(pending):
+                self._due[account] = self._window_start(day) + self._random_offset(slot, len(pending))
+            if pending:
+                _LOGGER.info(f"{day} 签到计划: " + ", ".join(
+                    f"{account}@{time.strftime('%H:%M:%S', time.localtime(due))}" for account, due in self._due.items()))
+            return
+        for account in accounts:
+            if account not in self._due and not self._signed_today(account, day):
+                self._due[account] = self._window_start(day) + random.uniform(0, self.window)
+
+    # 检查一次，提交所有到期的账号，返回本次提交的账号列表
+    def tick(self, now=None):
+        now = time.time() if now is None else now
+        day = datetime.date.fromtimestamp(now)
+        accounts = list_accounts()
+        submitted = []
+        with self._lock:
+            self._plan(day, accounts)
+            for account in accounts:
+                due = self._due.get(account)
+                if due is None or due > now or account in self._running or self._signed_today(account, day):
+                    continue
+                self._running.add(account)
+                submitted.append(account)
+                self._executor.submit(self._run_account, account, day)
+        return submitted
+
+    def _run_account(self, account, day):
+        _LOGGER.info(f"[{account}] 定时签到开始")
+        try:
+            result = self.sign_func(account)
+        except Exception as e:
+            _LOGGER.exception(f"[{account}] 定时签到异常")
+            result = {"success": False, "errors": [str(e)]}
+        else:
+            # 通知失败不影响签到结果，notify_result 内部只记录日志
+            if not result.get("reused"):
+                notify_result(result)
+        with self._lock:
+            self._running.discard(account)
+            account_state = self._state.setdefault(account, {})
+            account_state["last_attempt"] = time.time()
+            if result["success"]:
+                account_state["last_success"] = account_state["last_attempt"]
+                account_state["last_success_date"] = day.isoformat()
+                account_state.pop("last_error", None)
+                self._due.pop(account, None)
+                _LOGGER.info(f"[{account}] 定时签到成功")
+            else:
+                account_state["last_error"] = "；".join(str(error) for error in result.get("errors", []))
+                if self._day == day:
+                    self._due[account] = time.time() + self.retry_seconds
+                _LOGGER.warning(f"[{account}] 定时签到失败，{self.retry_seconds:.0f} 秒后重试")
+            self._save_state()
+
+    def status(self):
+        with self._lock:
+            return {
+                "day": self._day.isoformat() if self._day else None,
+                "due": dict(self._due),
+                "running": sorted(self._running),
+                "state": json.loads(json.dumps(self._state)),
+            }
+
+    def run_forever(self):
+        _LOGGER.info(f"签到调度器已启动: 每天 {self.start_time.strftime('%H:%M')} 起 {self.window:.0f} 秒内，"
+                     f"抖动 ±{self.jitter:.0f} 秒，并发 {self.concurrency}")
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception:
+                _LOGGER.exception("签到调度检查失败")
+            self._stop.wait(self.tick_seconds)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name="sign-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, wait=True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=wait)
+
+
+_scheduler: SignScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SignScheduler()
+        return _scheduler
+
+
+# 已创建的调度器，未启用时为 None
+def current_scheduler():
+    return _scheduler
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler()])
+    parser = argparse.ArgumentParser(description="按时间窗口分散执行多账号签到的守护进程")
+    parser.add_argument("--start", default=SIGN_SCHEDULE_START, help="每天开始签到的本地时间 HH:MM")
+    parser.add_argument("--window", type=float, default=SIGN_SCHEDULE_WINDOW_SECONDS, help="分散签到的时间窗口（秒）")
+    parser.add_argument("--jitter", type=float, default=SIGN_SCHEDULE_JITTER_SECONDS, help="随机抖动（秒）")
+    parser.add_argument("--concurrency", type=int, default=SIGN_SCHEDULE_CONCURRENCY, help="同时签到的账号数")
+    args = parser.parse_args()
+
+    get_notifier()
+    scheduler = SignScheduler(start=args.start, window=args.window, jitter=args.jitter, concurrency=args.concurrency)
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop(wait=False)
+    get_notifier().flush()
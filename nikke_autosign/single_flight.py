@@ -0,0 +1,62 @@
+import copy
+import threading
+import time
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# 按 key 合并并发调用：同一 key 同时只执行一次 func，期间的其他调用等待并共享其结果；
+# 完成后的结果在 cache_seconds 秒内直接返回（should_cache 返回 False 的结果不缓存）。
+# do() 返回 (result, reused)，reused 为 None（本次执行）、"joined"（加入进行中的调用）或 "cached"（命中缓存）
+class SingleFlight:
+    def __init__(self, cache_seconds=0.0, should_cache=None):
+        self.cache_seconds = cache_seconds
+        self.should_cache = should_cache
+        self._calls: dict[str, _Call] = {}
+        self._cache: dict[str, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                if time.monotonic() - cached[0] < self.cache_seconds:
+                    return copy.deepcopy(cached[1]), "cached"
+                del self._cache[key]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), "joined"
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            # 共享给其他调用方的是完成时的快照，调用方之后对 result 的修改不会影响它们
+            call.result = copy.deepcopy(result)
+            return result, None
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if (call.error is None and self.cache_seconds > 0
+                        and (self.should_cache is None or self.should_cache(call.result))):
+                    self._cache[key] = (time.monotonic(), call.result)
+            call.done.set()
+
+    # 清除 key 的缓存结果（不影响进行中的调用）
+    def forget(self, key):
+        with self._lock:
+            self._cache.pop(key, None)
@@ -0,0 +1,119 @@
+import atexit
+import logging
+import os
+import socket
+import subprocess
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# 等待隧道就绪的最长秒数
+TUNNEL_READY_TIMEOUT = float(os.getenv("TUNNEL_READY_TIMEOUT", "15"))
+SSH_USER = os.getenv("SSH_USER", "root")
+
+
+def find_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# 本地端口转发到远端 127.0.0.1:remote_port 的 SSH 隧道。
+# ssh 进程在前台运行（不使用 -f），由本对象持有并负责关闭；本地端口自动选择空闲端口
+class SSHTunnel:
+    def __init__(self, server, remote_port, user=SSH_USER, local_port=None, ready_timeout=TUNNEL_READY_TIMEOUT):
+        self.server = server
+        self.remote_port = remote_port
+        self.user = user
+        self._fixed_local_port = local_port
+        self.local_port = local_port
+        self.ready_timeout = ready_timeout
+        self._process: subprocess.Popen | None = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.local_port}"
+
+    def is_alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        if self.is_alive():
+            return self
+        # 每次（重新）启动都重新挑选空闲端口，避免旧端口被占用
+        self.local_port = self._fixed_local_port or find_free_port()
+        remote_server = f"127.0.0.1:{self.remote_port}"
+        _LOGGER.info(f"正在启动 SSH 隧道: 127.0.0.1:{self.local_port} -> {self.server} {remote_server}")
+        self._process = subprocess.Popen([
+            'ssh', '-L', f'127.0.0.1:{self.local_port}:{remote_server}', '-N',
+            '-o', 'StrictHostKeyChecking=no',
+            '-o', 'ExitOnForwardFailure=yes',
+            '-o', 'ServerAliveInterval=30',
+            f'{self.user}@{self.server}'
+        ], stdin=subprocess.DEVNULL)
+        try:
+            self._wait_ready()
+        except Exception:
+            self.close()
+            raise
+        _LOGGER.info(f"SSH 隧道已就绪，正在转发到 {remote_server}")
+        return self
+
+    # 轮询本地端口直到可以连接；ssh 只有在认证完成、转发建立后才会监听本地端口
+    def _wait_ready(self):
+        deadline = time.monotonic() + self.ready_timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"SSH 隧道进程已退出，返回码: {self._process.returncode}")
+            try:
+                with socket.create_connection(("127.0.0.1", self.local_port), timeout=0.5):
+                    return
+            except OSError:
+                time.sleep(0.1)
+        raise TimeoutError(f"SSH 隧道在 {self.ready_timeout} 秒内未就绪")
+
+    def close(self):
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        _LOGGER.info("SSH 隧道已关闭")
+        self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+_tunnels: dict[tuple, SSHTunnel] = {}
+_tunnels_lock = threading.Lock()
+
+
+# 进程内共享的隧道，多次上传复用同一个连接，隧道断开时自动重建，进程退出时关闭
+def get_tunnel(server, remote_port, user=SSH_USER):
+    key = (server, str(remote_port), user)
+    with _tunnels_lock:
+        tunnel = _tunnels.get(key)
+        if tunnel is None:
+            tunnel = _tunnels[key] = SSHTunnel(server, remote_port, user=user)
+        if not tunnel.is_alive():
+            tunnel.start()
+        return tunnel
+
+
+def close_tunnels():
+    with _tunnels_lock:
+        for tunnel in _tunnels.values():
+            tunnel.close()
+        _tunnels.clear()
+
+
+atexit.register(close_tunnels)
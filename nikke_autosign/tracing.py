@@ -0,0 +1,178 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_LOGGER = logging.getLogger(__name__)
+
+# 单次运行的时间线追踪，导出为 Chrome trace 格式（chrome://tracing 或 ui.perfetto.dev 打开），
+# 文件保存为 TRACE_DIR/<run_id>.json。未开启追踪时 span() 几乎没有开销
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+# 最多保留的 trace 文件数，超出后删除最早的
+MAX_KEEP_TRACES = int(os.getenv("MAX_KEEP_TRACES", "100"))
+# cProfile 结果保留的函数数（按累计耗时排序）
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "40"))
+
+_RUN_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# 当前运行的 tracer；asyncio 任务和 asyncio.to_thread 会复制上下文，因此并发的阅读/点赞也能记录到同一个 tracer
+_current_tracer: ContextVar["Tracer | None"] = ContextVar("current_tracer", default=None)
+
+
+class Tracer:
+    def __init__(self, name="run", run_id=None, profile=False):
+        self.run_id = run_id or uuid.uuid4().hex
+        self.name = name
+        self.profile = profile
+        self.profile_stats = None
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._profiler = None
+
+    # start/end 为 time.perf_counter() 的值
+    def add_span(self, name, cat, start, end, args=None):
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+            self._threads[thread.ident] = thread.name
+
+    # cProfile 只统计开启它的线程（即执行签到流程的线程），线程池中的请求只体现为 span
+    def start_profile(self):
+        if not self.profile:
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # 同一时间只能有一个 profiler 生效（如其他运行正在 profile）
+            _LOGGER.warning(f"[{self.run_id}] 无法开启 cProfile: {e}")
+            return
+        self._profiler = profiler
+
+    def stop_profile(self):
+        if self._profiler is None:
+            return
+        self._profiler.disable()
+        output = io.StringIO()
+        pstats.Stats(self._profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        self.profile_stats = output.getvalue()
+        self._profiler = None
+
+    def to_chrome_trace(self):
+        with self._lock:
+            events = sorted(self._events, key=lambda event: event["ts"])
+            threads = dict(self._threads)
+        metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                    for tid, name in threads.items()]
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "run_id": self.run_id,
+                "name": self.name,
+                "started_at": self.started_at,
+                "profile": self.profile_stats,
+            },
+        }
+
+    def save(self, trace_dir=TRACE_DIR):
+        os.makedirs(trace_dir, exist_ok=True)
+        path = os.path.join(trace_dir, f"{self.run_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        _evict_traces(trace_dir)
+        return path
+
+
+def _evict_traces(trace_dir, max_keep=MAX_KEEP_TRACES):
+    paths = [os.path.join(trace_dir, name) for name in os.listdir(trace_dir) if name.endswith(".json")]
+    if len(paths) <= max_keep:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:len(paths) - max_keep]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def current_tracer():
+    return _current_tracer.get()
+
+
+# 记录一个 span；yield 的字典会作为 span 的 args，可在块内补充信息（如响应状态码）
+@contextmanager
+def span(name, cat="step", **args):
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield args
+        return
+    start = time.perf_counter()
+    try:
+        yield args
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        tracer.add_span(name, cat, start, time.perf_counter(), args)
+
+
+# 在追踪下执行一次运行，结束时保存 trace 文件。已处于追踪中时复用外层 tracer，
+# 未开启（enabled 和 profile 均为 False）时 yield 当前 tracer（通常为 None）
+@contextmanager
+def trace_run(name, enabled=True, profile=False, run_id=None, trace_dir=TRACE_DIR):
+    tracer = _current_tracer.get()
+    if tracer is not None or not (enabled or profile):
+        yield tracer
+        return
+    tracer = Tracer(name=name, run_id=run_id, profile=profile)
+    token = _current_tracer.set(tracer)
+    tracer.start_profile()
+    try:
+        with span(name, "run"):
+            yield tracer
+    finally:
+        tracer.stop_profile()
+        _current_tracer.reset(token)
+        try:
+            path = tracer.save(trace_dir)
+            _LOGGER.info(f"trace 已保存: {path}")
+        except OSError as e:
+            _LOGGER.error(f"保存 trace 失败: {e}")
+
+
+def is_valid_run_id(run_id):
+    return bool(_RUN_ID_PATTERN.match(run_id or ""))
+
+
+# 按 run_id 读取 trace 文件内容，不存在时返回 None
+def load_trace(run_id, trace_dir=TRACE_DIR):
+    if not is_valid_run_id(run_id):
+        return None
+    path = os.path.join(trace_dir, f"{run_id}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,46 @@
+import logging
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_LOGGER = logging.getLogger(__name__)
+
+# 连接池参数：pool_connections 为缓存的 host 连接池个数，pool_maxsize 为每个 host 保持的最大连接数
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _create_session(pool_connections, pool_maxsize):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # 共享 session 不保存任何 cookie，cookie 由调用方按账号在每次请求时传入，避免账号间串号
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+# 进程级共享 session，多次签到、多个账号复用同一个连接池（keep-alive 连接）
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session(HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE)
+                _LOGGER.info(f"初始化共享连接池: pool_connections={HTTP_POOL_CONNECTIONS}, "
+                             f"pool_maxsize={HTTP_POOL_MAXSIZE}")
+    return _session
+
+
+def close_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
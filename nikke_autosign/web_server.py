@@ -0,0 +1,284 @@
+# app.py
+import json
+import logging
+import os
+import time
+import traceback
+
+from flask import Flask, Response, request, jsonify
+
+from .common import DEFAULT_ACCOUNT, is_valid_account_name, list_accounts, save_account_cookies
+from .cookie_store import COOKIE_STORE
+from .deadline import SIGN_BUDGET
+from .jobs import JobQueue
+from .logging_setup import setup_logging
+from .metrics import render_metrics
+from .notifier import get_notifier
+from .run_history import get_run_history
+from .sign_runner import sign_accounts_and_notify, sign_and_notify
+from .sign_scheduler import SIGN_SCHEDULER_ENABLED, current_scheduler, get_scheduler
+from .tracing import is_valid_run_id, load_trace
+
+app = Flask(__name__)
+
+# 配置
+UPLOAD_FOLDER = 'upload'
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+COOKIES_PATH = "cookies.json"
+app.config['COOKIES_PATH'] = COOKIES_PATH
+
+_LOGGER = logging.getLogger(__name__)
+
+# 后台签到任务队列，/sign 立即返回 job_id，通过 /jobs/<job_id> 查询
+job_queue = JobQueue()
+
+
+# ✅ 统一响应格式函数
+def make_response(success=True, message="操作成功", data=None):
+    return jsonify({
+        "success": success,
+        "message": message,
+        "data": data
+    })
+
+
+# ✅ 自定义业务异常
+class ApiException(Exception):
+    def __init__(self, message="请求失败", status_code=400):
+        super().__init__()
+        self.message = message
+        self.status_code = status_code
+
+
+# 🛡️ 全局异常处理器
+
+@app.errorhandler(ApiException)
+def handle_api_exception(e):
+    _LOGGER.warning(f"ApiException: {e.message}")
+    return make_response(success=False, message=e.message), e.status_code
+
+
+@app.errorhandler(404)
+def handle_not_found(e):
+    return make_response(success=False, message="接口未找到"), 404
+
+
+@app.errorhandler(405)
+def handle_method_not_allowed(e):
+    return make_response(success=False, message="请求方法不被允许"), 405
+
+
+@app.errorhandler(500)
+def handle_internal_error(e):
+    # 记录完整堆栈
+    _LOGGER.error(f"InternalServerError: {str(e)}\n{traceback.format_exc()}")
+    return make_response(success=False, message="服务器内部错误"), 500
+
+
+# 捕获所有未处理的异常（包括 ValueError, FileNotFoundError 等）
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    _LOGGER.error(f"UnexpectedError: {str(e)}\n{traceback.format_exc()}")
+    return make_response(success=False, message="操作失败"), 500
+
+
+def get_upload_cookies_path():
+    return os.path.join(app.config['UPLOAD_FOLDER'], app.config['COOKIES_PATH'])
+
+
+# 请求体中可选的 "budget"：单个账号签到的总时间预算（秒）
+def get_budget(data):
+    budget = data.get("budget", SIGN_BUDGET)
+    if isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget <= 0:
+        raise ApiException("budget 必须是正数（秒）")
+    return float(budget)
+
+
+# 查询参数中的正整数，缺省时返回 default
+def get_int_arg(name, default=None, maximum=None):
+    value = request.args.get(name)
+    if value is None:
+        return default
+    if not value.isdigit() or int(value) < 1:
+        raise ApiException(f"{name} 必须是正整数")
+    return min(int(value), maximum) if maximum else int(value)
+
+
+# 可选 ?days=N：只统计最近 N 天
+def get_since_arg():
+    days = get_int_arg("days")
+    return None if days is None else time.time() - days * 86400
+
+
+# ✅ 接口1：上传 Cookies（可通过 ?account=xxx 指定账号，默认账号写入 upload/cookies.json）
+@app.route('/upload_cookies', methods=['POST'])
+def upload_cookies():
+    account = request.args.get('account', DEFAULT_ACCOUNT)
+    if not is_valid_account_name(account):
+        raise ApiException(f"账号名不合法: {account}")
+
+    if 'file' in request.files:
+        file = request.files['file']
+        if not file.filename:
+            raise ApiException("未选择文件")
+
+        if not file.filename.endswith('.json'):
+            raise ApiException("仅支持 .json 文件")
+
+        try:
+            data = json.load(file.stream)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ApiException(f"cookies 文件格式错误，JSON 解析失败: {str(e)}")
+        if not isinstance(data, (dict, list)):
+            raise ApiException("cookies 文件内容必须是对象或数组")
+
+        filepath = save_account_cookies(account, data)
+        return make_response(message="Cookies 文件上传成功", data={"account": account, "path": filepath})
+
+    if request.is_json:
+        data = request.get_json()
+        if not isinstance(data, dict):
+            raise ApiException("JSON 数据必须是一个 Cookie 字典")
+
+        filepath = save_account_cookies(account, data)
+        return make_response(message="Cookies JSON 数据保存成功", data={"account": account, "path": filepath})
+
+    raise ApiException("请上传 JSON 文件或发送 JSON 字典")
+
+
+# ✅ 批量上传多个账号的 Cookies，body 为 {"账号名": {Cookie 字典}, ...}
+@app.route('/upload_cookies_batch', methods=['POST'])
+def upload_cookies_batch():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data:
+        raise ApiException("JSON 数据必须是 {账号名: Cookie 字典} 的对象")
+    for account, cookies in data.items():
+        if not is_valid_account_name(account):
+            raise ApiException(f"账号名不合法: {account}")
+        if not isinstance(cookies, dict):
+            raise ApiException(f"账号 {account} 的 Cookies 必须是字典")
+
+    saved = {account: save_account_cookies(account, cookies) for account, cookies in data.items()}
+    return make_response(message=f"已保存 {len(saved)} 个账号的 Cookies", data=saved)
+
+
+# ✅ 接口2：提交签到任务
+@app.route('/sign', methods=['POST'])
+def sign():
+    filepath = get_upload_cookies_path()
+    # 从 cookie 缓存读取，文件未变化时不再读盘解析
+    try:
+        cookies = COOKIE_STORE.load(filepath)
+    except FileNotFoundError:
+        raise ApiException("未找到 cookies 文件，请先上传")
+    except json.JSONDecodeError as e:
+        raise ApiException(f"cookies 文件格式错误，JSON 解析失败: {str(e)}")
+    except Exception as e:
+        raise ApiException(f"读取 cookies 文件时发生错误: {str(e)}")
+
+    if not isinstance(cookies, (dict, list)):
+        raise ApiException("cookies 文件内容必须是对象或数组")
+
+    data = request.get_json(silent=True) or {}
+    budget = get_budget(data)
+    # 可选 {"trace": true, "profile": true}：记录本次运行的时间线，结果中的 trace_id 可用于 /traces/<trace_id>
+    # 可选 {"force": true}：忽略最近一次成功签到的缓存结果
+    trace, profile, force = data.get("trace", False), data.get("profile", False), data.get("force", False)
+    if not all(isinstance(flag, bool) for flag in (trace, profile, force)):
+        raise ApiException("trace、profile 和 force 必须是布尔值")
+    # 同一账号的签到任务未结束时直接返回该任务，不重复签到
+    job_id, joined = job_queue.submit_unique(f"sign:{DEFAULT_ACCOUNT}", "sign", sign_and_notify, cookies,
+                                             budget=budget, trace=trace, profile=profile, force=force)
+    message = "签到任务进行中，已加入该任务" if joined else "签到任务已提交"
+    return make_response(message=message, data={"job_id": job_id, "joined": joined}), 202
+
+
+# ✅ 接口3：多账号并发签到，body 可选 {"accounts": ["a", "b"]}，默认签到全部账号
+@app.route('/sign_accounts', methods=['POST'])
+def sign_all_accounts():
+    data = request.get_json(silent=True) or {}
+    accounts = data.get("accounts")
+    if accounts is not None:
+        if not isinstance(accounts, list) or not all(isinstance(a, str) for a in accounts):
+            raise ApiException("accounts 必须是账号名数组")
+        known_accounts = set(list_accounts())
+        unknown = [a for a in accounts if a not in known_accounts]
+        if unknown:
+            raise ApiException(f"未找到账号 cookies: {unknown}")
+    elif not list_accounts():
+        raise ApiException("未找到任何账号 cookies，请先上传")
+
+    workers = data.get("workers")
+    if workers is not None and (not isinstance(workers, int) or workers < 1):
+        raise ApiException("workers 必须是正整数")
+
+    budget = get_budget(data)
+    job_id = job_queue.submit("sign_accounts", sign_accounts_and_notify, accounts, max_workers=workers, budget=budget)
+    return make_response(message="多账号签到任务已提交", data={"job_id": job_id}), 202
+
+
+# ✅ 接口4：查询后台任务状态、各步骤耗时及结果
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise ApiException("任务不存在", status_code=404)
+    return make_response(message="查询成功", data=job)
+
+
+# ✅ 接口5：下载签到运行的 trace 文件（Chrome trace 格式，可在 chrome://tracing 或 ui.perfetto.dev 打开）
+@app.route('/traces/<trace_id>', methods=['GET'])
+def get_trace(trace_id):
+    if not is_valid_run_id(trace_id):
+        raise ApiException("trace_id 格式错误")
+    content = load_trace(trace_id)
+    if content is None:
+        raise ApiException("trace 不存在", status_code=404)
+    return Response(content, mimetype="application/json")
+
+
+# ✅ 接口6：签到运行历史，可选 ?account=xxx&days=7&limit=50
+@app.route('/runs', methods=['GET'])
+def list_runs():
+    runs = get_run_history().list_runs(account=request.args.get("account"), since=get_since_arg(),
+                                       limit=get_int_arg("limit", 50, maximum=1000))
+    return make_response(message="查询成功", data=runs)
+
+
+# ✅ 接口7：按账号聚合的成功率、耗时 p50/p95、积分趋势和上游错误分布，可选 ?account=xxx&days=7
+@app.route('/runs/stats', methods=['GET'])
+def run_stats():
+    stats = get_run_history().stats(account=request.args.get("account"), since=get_since_arg())
+    return make_response(message="查询成功", data=stats)
+
+
+# ✅ 接口8：内置签到调度器的当天计划和各账号最近一次签到状态（需设置 SIGN_SCHEDULER_ENABLED=1 或 serve --scheduler）
+@app.route('/scheduler', methods=['GET'])
+def scheduler_status():
+    scheduler = current_scheduler()
+    if scheduler is None:
+        raise ApiException("签到调度器未启用", status_code=404)
+    return make_response(message="查询成功", data=scheduler.status())
+
+
+# ✅ 接口9：Prometheus 文本格式的运行指标（上游请求、限速/重试等待、推送、签到结果与积分）
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+# 启动 Web 服务；scheduler=True 时同时启动内置签到调度器
+def run_server(host='0.0.0.0', port=5000, scheduler=SIGN_SCHEDULER_ENABLED):
+    # 日志经队列由后台线程写出（控制台 + 压缩轮转的 app.log），请求线程不阻塞在日志 I/O 上
+    setup_logging()
+    # 启动通知分发器，继续发送上次未发送成功的通知
+    get_notifier()
+    # 代替外部 cron：在进程内按时间窗口分散签到各账号
+    if scheduler:
+        get_scheduler().start()
+    app.run(host=host, port=port, debug=False)  # 注意：生产环境务必 debug=False
+
+
+if __name__ == '__main__':
+    run_server()
@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from nikke_autosign import retry
+from nikke_autosign.blablalink_reader import BlablaLinkReader
+from nikke_autosign.deadline import Deadline, DeadlineExceeded
+from nikke_autosign.retry import CircuitBreaker, CircuitOpenError
+
+HOST = "breaker-test.invalid"
+
+
+class FixedPacer:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def reserve(self, host):
+        return self.delay
+
+
+def open_breaker(breaker):
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(HOST, failure_threshold=1, recovery_seconds=0.05)
+    monkeypatch.setitem(retry._breakers, HOST, breaker)
+    return breaker
+
+
+def test_half_open_allows_single_trial(breaker):
+    open_breaker(breaker)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_trial_reopens(breaker):
+    open_breaker(breaker)
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_released_trial_can_be_retried(breaker):
+    open_breaker(breaker)
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+
+
+# 试探请求在限速等待时超出时间预算，不能一直占用试探名额
+def test_deadline_during_trial_releases_breaker(breaker):
+    open_breaker(breaker)
+    time.sleep(0.06)
+    reader = BlablaLinkReader(cookies={"token": "x"}, pacer=FixedPacer(1.0), deadline=Deadline(0.05))
+    with pytest.raises(DeadlineExceeded):
+        reader.api_get(f"http://{HOST}/api/GetPost", message="获取帖子")
+    assert breaker.state == "half_open"
+    breaker.before_call()
@@ -0,0 +1,35 @@
+import time
+
+from nikke_autosign import cookie_scheduler
+from nikke_autosign.cookie_scheduler import REFRESH_LEAD_SECONDS, REFRESH_MIN_INTERVAL_SECONDS, earliest_expiry, next_refresh_at
+
+
+def test_short_lived_cookie_ignored():
+    now = time.time()
+    meta = {"refreshed_at": now, "expiry": {"__cf_bm": now + 1800, "token": now + 7 * 86400}}
+    assert earliest_expiry(meta, critical_cookies=[]) == now + 7 * 86400
+    assert next_refresh_at(meta, critical_cookies=[]) == now + 7 * 86400 - REFRESH_LEAD_SECONDS
+
+
+def test_min_interval_after_refresh():
+    now = time.time()
+    meta = {"refreshed_at": now, "expiry": {"token": now + 60}}
+    assert next_refresh_at(meta, critical_cookies=["token"]) == now + REFRESH_MIN_INTERVAL_SECONDS
+
+
+def test_scheduler_refreshes_each_account_once(monkeypatch):
+    meta = {}
+    refreshed = []
+
+    def fake_refresh(account, email, password, headless=True, profile_dir=None):
+        refreshed.append(account)
+        now = time.time()
+        meta[account] = {"refreshed_at": now, "expiry": {"__cf_bm": now + 1800}}
+
+    monkeypatch.setattr(cookie_scheduler, "load_accounts",
+                        lambda path: [("default", "a@example.com", "x"), ("alt", "b@example.com", "y")])
+    monkeypatch.setattr(cookie_scheduler, "load_cookies_meta", lambda: dict(meta))
+    monkeypatch.setattr(cookie_scheduler, "refresh_and_upload", fake_refresh)
+    cookie_scheduler.run_scheduler(once=True)
+    cookie_scheduler.run_scheduler(once=True)
+    assert refreshed == ["default", "alt"]
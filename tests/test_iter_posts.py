@@ -0,0 +1,83 @@
+import pytest
+import requests
+
+from nikke_autosign import blablalink_reader
+from nikke_autosign.blablalink_reader import ApiResponseError, BlablaLinkReader
+from nikke_autosign.deadline import DeadlineExceeded
+
+
+class StubFeedIndex:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def get_cursor(self, account, feed):
+        return self.cursor
+
+    def clear_cursor(self, account, feed):
+        self.cursor = None
+
+    def save_cursor(self, account, feed, cursor):
+        self.cursor = cursor
+
+    def liked_uuids(self, account, uuids):
+        return set()
+
+    def record_posts(self, account, posts):
+        pass
+
+
+def make_reader(feed_index, first_error):
+    reader = BlablaLinkReader(cookies={"token": "x"}, feed_index=feed_index)
+    calls = []
+
+    def fetch(cursor, page):
+        calls.append(cursor)
+        if cursor == "saved":
+            raise first_error
+        return [("1", "post", False)], None
+
+    reader._fetch_post_page = fetch
+    return reader, calls
+
+
+def test_rejected_cursor_restarts_from_top():
+    feed_index = StubFeedIndex("saved")
+    reader, calls = make_reader(feed_index, ApiResponseError("bad cursor"))
+    assert list(reader.iter_posts()) == [("1", "post", False)]
+    assert calls == ["saved", None]
+    assert feed_index.cursor is None
+
+
+def test_other_errors_keep_cursor():
+    feed_index = StubFeedIndex("saved")
+    reader, calls = make_reader(feed_index, DeadlineExceeded("out of time"))
+    with pytest.raises(DeadlineExceeded):
+        list(reader.iter_posts())
+    assert calls == ["saved"]
+    assert feed_index.cursor == "saved"
+
+
+class RejectingSession:
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = b'{"code": 1001, "msg": "invalid cursor"}'
+        resp.request = requests.Request(method, url).prepare()
+        resp.raw = None
+        return resp
+
+
+# 接口拒绝（非 0 code）不按重试策略重试，只调用一次
+def test_api_rejection_is_not_retried(monkeypatch):
+    monkeypatch.setattr(blablalink_reader, "extract_cookies_to_jar", lambda *args: None)
+    reader = BlablaLinkReader(cookies={"token": "x"})
+    reader.init_session()
+    reader.session = RejectingSession()
+    reader.pacer = type("NoPacer", (), {"reserve": staticmethod(lambda host: 0.0)})()
+    with pytest.raises(ApiResponseError):
+        reader.api_post("http://reject-test.invalid/api/GetPostList", {"nextPageCursor": "stale"})
+    assert reader.session.calls == 1
@@ -0,0 +1,33 @@
+import logging
+
+import pytest
+
+from nikke_autosign import logging_setup
+
+
+@pytest.fixture
+def restore_root():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    logging_setup._stop_current_listener()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_setup_logging_replaces_previous_listener(restore_root):
+    first = logging_setup.setup_logging(log_file=None)
+    second = logging_setup.setup_logging(log_file=None)
+    assert first._thread is None
+    assert second._thread is not None
+    queue_handlers = [h for h in logging.getLogger().handlers if isinstance(h, logging_setup.QueueHandler)]
+    assert len(queue_handlers) == 1
+
+
+def test_stop_is_safe_after_manual_stop(restore_root):
+    listener = logging_setup.setup_logging(log_file=None)
+    listener.stop()
+    logging_setup._stop_current_listener()
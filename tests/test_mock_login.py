@@ -0,0 +1,62 @@
+import time
+
+import pytest
+import requests
+
+from nikke_autosign import auto_refresh_cookies
+from mock_blablalink import SESSION_COOKIE, start_mock_server
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server, url = start_mock_server(latency=0, latency_jitter=0, web_users={"a@example.com": "secret"})
+    yield url
+    server.shutdown()
+
+
+def test_login_page_has_form(base_url):
+    html = requests.get(f"{base_url}/login", timeout=5).text
+    for element_id in ("loginPwdForm_account", "loginPwdForm_password"):
+        assert f'id="{element_id}"' in html
+    assert 'name="confirm" type="submit"' in html
+    assert "location.replace" not in html
+
+
+def test_login_sets_session_and_redirects(base_url):
+    with requests.Session() as session:
+        bad = session.post(f"{base_url}/login", data={"account": "a@example.com", "password": "wrong"}, timeout=5)
+        assert bad.status_code == 401
+        ret = session.post(f"{base_url}/login", data={"account": "a@example.com", "password": "secret"},
+                           allow_redirects=False, timeout=5)
+        assert ret.status_code == 302 and ret.headers["Location"] == "/"
+        assert SESSION_COOKIE in session.cookies
+        # 已登录时表单照常渲染，随后由脚本跳转
+        html = session.get(f"{base_url}/login", timeout=5).text
+        assert 'id="loginPwdForm_account"' in html and "location.replace" in html
+
+
+class FakeDriver:
+    def __init__(self, redirect_after):
+        self.redirect_after = redirect_after
+        self.loaded_at = None
+
+    def get(self, url):
+        self.loaded_at = time.monotonic()
+
+    @property
+    def current_url(self):
+        if self.redirect_after is not None and time.monotonic() - self.loaded_at >= self.redirect_after:
+            return f"{auto_refresh_cookies.WEB_URL}/"
+        return auto_refresh_cookies.LOGIN_URL
+
+
+def test_session_check_waits_for_redirect(monkeypatch):
+    pytest.importorskip("selenium")
+    monkeypatch.setattr(auto_refresh_cookies, "SESSION_CHECK_TIMEOUT", 2)
+    assert auto_refresh_cookies._is_logged_in(FakeDriver(redirect_after=0.5))
+
+
+def test_session_check_without_redirect(monkeypatch):
+    pytest.importorskip("selenium")
+    monkeypatch.setattr(auto_refresh_cookies, "SESSION_CHECK_TIMEOUT", 0.5)
+    assert not auto_refresh_cookies._is_logged_in(FakeDriver(redirect_after=None))
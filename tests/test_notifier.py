@@ -0,0 +1,41 @@
+import json
+import os
+
+from nikke_autosign.notifier import Notifier
+
+
+def make_notifier(queue_dir, sent):
+    return Notifier(queue_dir=str(queue_dir), digest_window=3600, send_func=lambda **kwargs: sent.append(kwargs))
+
+
+def test_live_queues_are_not_shared(tmp_path):
+    sent = []
+    first = make_notifier(tmp_path, sent)
+    first.notify("a")
+    second = make_notifier(tmp_path, sent)
+    assert second._pending == []
+    assert first.queue_path != second.queue_path
+    with open(first.queue_path, encoding="utf-8") as f:
+        assert [item["title"] for item in json.load(f)] == ["a"]
+
+
+def test_adopts_queue_of_exited_process(tmp_path):
+    item = {"id": "x", "title": "left over", "message": "", "created_at": 0, "attempts": 0, "next_try": 0.0}
+    (tmp_path / "123-dead.json").write_text(json.dumps([item]), encoding="utf-8")
+    (tmp_path / "123-dead.lock").write_text("", encoding="utf-8")
+    notifier = make_notifier(tmp_path, [])
+    assert [pending["title"] for pending in notifier._pending] == ["left over"]
+    assert not os.path.exists(tmp_path / "123-dead.json")
+    with open(notifier.queue_path, encoding="utf-8") as f:
+        assert json.load(f)[0]["id"] == "x"
+
+
+def test_persist_failure_does_not_raise(tmp_path, monkeypatch):
+    notifier = make_notifier(tmp_path, [])
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("nikke_autosign.notifier.atomic_write_json", fail)
+    notifier.notify("still queued")
+    assert [item["title"] for item in notifier._pending] == ["still queued"]
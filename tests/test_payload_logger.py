@@ -0,0 +1,24 @@
+import logging
+
+import pytest
+
+from nikke_autosign.common import get_payload_logger
+
+
+@pytest.fixture
+def root_warning():
+    root = logging.getLogger()
+    old_level = root.level
+    root.setLevel(logging.WARNING)
+    yield
+    root.setLevel(old_level)
+
+
+def test_payload_logger_inherits_root_level(root_warning):
+    logger = get_payload_logger("payload_test_inherit")
+    assert not logger.isEnabledFor(logging.INFO)
+
+
+def test_payload_logger_explicit_level(root_warning):
+    logger = get_payload_logger("payload_test_explicit", level="INFO")
+    assert logger.isEnabledFor(logging.INFO)
@@ -0,0 +1,23 @@
+import time
+
+from nikke_autosign.run_history import RunHistory, open_run_history_readonly
+
+
+def test_readonly_missing_db_is_not_created(tmp_path):
+    path = tmp_path / "run_history.db"
+    assert open_run_history_readonly(str(path)) is None
+    assert not path.exists()
+
+
+def test_readonly_reads_without_pruning(tmp_path):
+    path = str(tmp_path / "run_history.db")
+    history = RunHistory(path, keep_days=0, flush_seconds=0)
+    history.record("a", time.time() - 400 * 86400, 1.0, {"success": True})
+    history.record("a", time.time(), 2.0, {"success": False})
+    history.close()
+
+    readonly = open_run_history_readonly(path)
+    try:
+        assert readonly.stats()["a"]["runs"] == 2
+    finally:
+        readonly.close()
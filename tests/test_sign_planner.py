@@ -0,0 +1,77 @@
+import pytest
+
+from nikke_autosign.blablalink_reader import BlablaLinkReader
+from nikke_autosign.sign_planner import _task_kind, build_plan
+
+
+def task(name, done=False, task_id="0"):
+    return {"task_id": task_id, "task_name": name, "reward_infos": [{"is_completed": done}]}
+
+
+@pytest.mark.parametrize("name, kind", [
+    ("每日簽到", "check_in"),
+    ("瀏覽3篇貼文", "read"),
+    ("阅读 3 篇帖子", "read"),
+    ("點讚5篇貼文", "like"),
+    ("Like 5 posts", "like"),
+    ("Read 3 posts", "read"),
+    ("獲得5個讚", None),
+    ("收到點讚", None),
+    ("Receive 5 likes", None),
+    ("Review the event", None),
+    ("view the event page", None),
+])
+def test_task_kind(name, kind):
+    assert _task_kind(task(name)) == kind
+
+
+def test_check_in_by_id():
+    assert _task_kind(task("anything", task_id="15")) == "check_in"
+
+
+def test_unrelated_task_does_not_force_posts():
+    plan = build_plan([task("每日簽到", done=True, task_id="15"), task("點讚5篇貼文", done=True),
+                       task("獲得5個讚")])
+    assert plan["posts"] == 0
+    assert plan["pending_tasks"] == []
+    assert plan["skipped_tasks"] == ["獲得5個讚"]
+
+
+def test_unrecognized_task_list_falls_back_to_full_posts():
+    plan = build_plan([task("新任務")])
+    assert plan["posts"] >= 6
+
+
+class StubReader:
+    is_task_completed = staticmethod(BlablaLinkReader.is_task_completed)
+
+    def __init__(self, tasks):
+        self.account = "default"
+        self.tasks = tasks
+        self.checked_in = False
+
+    def get_task_list(self):
+        return self.tasks
+
+    def check_in(self):
+        self.checked_in = True
+        self.tasks[0]["reward_infos"][0]["is_completed"] = True
+
+    def check_task_finished(self, is_required=None):
+        return BlablaLinkReader.check_task_finished(self, is_required)
+
+    def get_total_reward(self):
+        return 100
+
+
+# 计划跳过的任务（如 獲得5個讚）在最终检查中也不要求完成，首次运行即成功
+def test_skipped_task_not_required_by_final_check():
+    from nikke_autosign.deadline import Deadline
+    from nikke_autosign.sign_runner import _run_sign
+
+    reader = StubReader([task("每日簽到", task_id="15"), task("點讚5篇貼文", done=True), task("獲得5個讚")])
+    result = _run_sign(reader, Deadline())
+    assert reader.checked_in
+    assert result["plan"]["skipped_tasks"] == ["獲得5個讚"]
+    assert result["success"], result["errors"]
+    assert result["total_points"] == 100
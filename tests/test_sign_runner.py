@@ -0,0 +1,26 @@
+from nikke_autosign.deadline import Deadline, DeadlineExceeded
+from nikke_autosign.sign_runner import _run_sign
+
+
+def task(name, done=False, task_id="0"):
+    return {"task_id": task_id, "task_name": name, "reward_infos": [{"is_completed": done}]}
+
+
+class TimeoutCheckReader:
+    account = "default"
+
+    def get_task_list(self):
+        return [task("每日簽到", task_id="15")]
+
+    def check_in(self):
+        pass
+
+    def check_task_finished(self, is_required=None):
+        raise DeadlineExceeded("请求超时")
+
+
+def test_deadline_in_final_check_is_partial():
+    result = _run_sign(TimeoutCheckReader(), Deadline())
+    assert not result["success"]
+    assert result["partial"]
+    assert any("未完成" in error for error in result["errors"])